@@ -2,17 +2,36 @@
 pgdn-orchestrator: Intelligent scan orchestration for DePIN validator networks
 """
 
-from .agent import OrchestrationAgent
-from .models import OrchestrationDecision, Node, Organisation, ScanPolicy
+from .agent import OrchestrationAgent, get_default_agent
+from .models import (
+    OrchestrationDecision,
+    Node,
+    Organisation,
+    ScanPolicy,
+    ScanLevel,
+    ScanLevelEnum,
+    NextAction,
+    NodeStatus,
+    ScanHistory,
+)
 from .exceptions import OrchestrationError, AIProviderError
+from .cache import LLMCache, DecisionCache
 
 __version__ = "0.1.0"
 __all__ = [
     "OrchestrationAgent",
+    "get_default_agent",
     "OrchestrationDecision", 
     "Node",
     "Organisation",
     "ScanPolicy",
+    "ScanLevel",
+    "ScanLevelEnum",
+    "NextAction",
+    "NodeStatus",
+    "ScanHistory",
     "OrchestrationError",
     "AIProviderError",
+    "LLMCache",
+    "DecisionCache",
 ]
@@ -3,10 +3,14 @@ Main orchestration agent implementation
 """
 
 import os
-import json
+import time
+import asyncio
+import functools
 import logging
-from typing import Optional, Dict, Any
-from datetime import datetime, timedelta
+import weakref
+from typing import Optional, Dict, Any, Callable, List, NoReturn, Tuple, Union, cast, overload
+
+from pydantic import TypeAdapter
 
 try:
     import openai
@@ -18,19 +22,131 @@ try:
 except ImportError:
     anthropic = None
 
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
 from .models import (
     OrchestrationDecision, 
+    BatchDecisionResponse,
     Node, 
     Organisation, 
     ScanPolicy,
     ScanLevel,
-    NextAction
+    decision_llm_schema,
+    NextAction,
+    NodeStatus
 )
 from .exceptions import AIProviderError, InvalidConfigurationError, PermissionDeniedError
 from .prompts import PromptGenerator
+from .cache import LLMCache, DecisionCache
 
 logger = logging.getLogger(__name__)
 
+# Rate-limited provider lanes are skipped for an exponentially growing period
+_RATE_LIMIT_BACKOFF_INITIAL = 1.0
+_RATE_LIMIT_BACKOFF_MAX = 60.0
+
+# Output token allowance for a single decision; batches scale it by node count
+_MAX_TOKENS_PER_DECISION = 1024
+
+# Output cap of the default Anthropic model; requests above it are rejected
+_MAX_OUTPUT_TOKENS = 8192
+
+# Largest batch whose scaled allowance still fits under the output cap
+_MAX_BATCH_SIZE = _MAX_OUTPUT_TOKENS // _MAX_TOKENS_PER_DECISION
+
+def _decision_tool_schemas() -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """JSON schemas for single and batched decision tool calls"""
+    
+    single = decision_llm_schema()
+    defs = single.pop("$defs", {})
+    
+    item = dict(single)
+    item["properties"] = {
+        "index": {"type": "integer", "minimum": 0, "description": "Node index from the prompt"},
+        **single["properties"]
+    }
+    item["required"] = ["index", *single.get("required", [])]
+    batch = {
+        "type": "object",
+        "properties": {"decisions": {"type": "array", "items": item}},
+        "required": ["decisions"],
+        "$defs": defs
+    }
+    
+    single["$defs"] = defs
+    return single, batch
+
+_DECISION_SCHEMA, _BATCH_DECISION_SCHEMA = _decision_tool_schemas()
+
+_DECISION_TOOL = {
+    "name": "emit_decision",
+    "description": "Record the orchestration decision for the node",
+    "input_schema": _DECISION_SCHEMA
+}
+
+_BATCH_DECISION_TOOL = {
+    "name": "emit_decisions",
+    "description": "Record one orchestration decision per node",
+    "input_schema": _BATCH_DECISION_SCHEMA
+}
+
+# Connection pool shared by all provider clients of an agent
+_HTTP_POOL_LIMITS = {"max_connections": 50, "max_keepalive_connections": 20}
+
+# Validators compiled once; provider output is parsed and validated in one pass
+_DECISION_ADAPTER = TypeAdapter(OrchestrationDecision)
+_BATCH_ADAPTER = TypeAdapter(BatchDecisionResponse)
+
+# Cached responses drop creation timestamps so hits are stamped afresh
+_DECISION_CACHE_EXCLUDE: Dict[str, Any] = {"ts_ns": True, "timestamp": True}
+_BATCH_CACHE_EXCLUDE: Dict[str, Any] = {"decisions": {"__all__": {"ts_ns", "timestamp"}}}
+
+AIResponse = Union[OrchestrationDecision, BatchDecisionResponse]
+
+_SYS_PROMPT = (
+    "You are an infrastructure orchestration agent. "
+    "Output must be valid JSON that matches the required schema exactly."
+)
+
+@functools.lru_cache(maxsize=128)
+def _cached_scan_policy(items: Tuple[Tuple[str, Any], ...]) -> ScanPolicy:
+    """Validate a policy once per distinct set of values"""
+    return ScanPolicy.from_untrusted(dict(items))
+
+def _to_scan_policy(scan_policy: Union[Dict[str, Any], ScanPolicy]) -> ScanPolicy:
+    """Convert a policy dict to a (shared, frozen) ScanPolicy"""
+    if not isinstance(scan_policy, dict):
+        return scan_policy
+    try:
+        return _cached_scan_policy(tuple(sorted(scan_policy.items())))
+    except TypeError:
+        # Unhashable values cannot be cached; validate directly
+        return ScanPolicy.from_untrusted(scan_policy)
+
+def _response_adapter(batch_size: Optional[int]) -> TypeAdapter:
+    """Validator for single or batched AI output"""
+    return _BATCH_ADAPTER if batch_size else _DECISION_ADAPTER
+
+def _from_cache(cached: Dict[str, Any], batch_size: Optional[int]) -> AIResponse:
+    """Rebuild a cached response; entries were validated before they were stored"""
+    model = BatchDecisionResponse if batch_size else OrchestrationDecision
+    return model.from_trusted(cached)
+
+def _cache_payload(response: AIResponse) -> Dict[str, Any]:
+    """JSON-safe form of an AI response for the response cache"""
+    exclude = _BATCH_CACHE_EXCLUDE if isinstance(response, BatchDecisionResponse) else _DECISION_CACHE_EXCLUDE
+    return response.model_dump(mode="json", exclude=exclude)
+
+def _is_rate_limit_error(error: Exception) -> bool:
+    """Whether an exception is a provider rate-limit (HTTP 429) error"""
+    return any(
+        module is not None and isinstance(error, module.RateLimitError)
+        for module in (anthropic, openai)
+    )
+
 class OrchestrationAgent:
     """
     AI-powered orchestration agent for DePIN scan decisions
@@ -40,10 +156,13 @@ class OrchestrationAgent:
         self,
         openai_api_key: Optional[str] = None,
         anthropic_api_key: Optional[str] = None,
+        anthropic_api_keys: Optional[List[str]] = None,
         openai_model: str = "gpt-4o",
         anthropic_model: str = "claude-3-5-sonnet-20241022",
         temperature: float = 0.2,
-        enable_fallback: bool = True
+        enable_fallback: bool = True,
+        cache: Optional[LLMCache] = None,
+        decision_cache: Optional[DecisionCache] = None
     ):
         """
         Initialize the orchestration agent
@@ -51,17 +170,28 @@ class OrchestrationAgent:
         Args:
             openai_api_key: OpenAI API key (defaults to OPENAI_API_KEY env var)
             anthropic_api_key: Anthropic API key (defaults to ANTHROPIC_API_KEY env var)
+            anthropic_api_keys: Several Anthropic keys (e.g. subscription and API), each
+                rate-limited independently; takes precedence over anthropic_api_key
             openai_model: OpenAI model to use
             anthropic_model: Anthropic model to use
             temperature: AI temperature setting
             enable_fallback: Enable fallback between providers
+            cache: Optional response cache consulted before calling a provider
+            decision_cache: Optional persistent cache reusing AI decisions for unchanged inputs
         """
         self.openai_api_key = openai_api_key or os.getenv("OPENAI_API_KEY")
         self.anthropic_api_key = anthropic_api_key or os.getenv("ANTHROPIC_API_KEY")
+        self.anthropic_api_keys = anthropic_api_keys or (
+            [self.anthropic_api_key] if self.anthropic_api_key else []
+        )
         self.openai_model = openai_model
         self.anthropic_model = anthropic_model
         self.temperature = float(os.getenv("ORCHESTRATION_TEMPERATURE", temperature))
         self.enable_fallback = enable_fallback
+        self.cache = cache
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.decision_cache = decision_cache
         
         self.prompt_generator = PromptGenerator()
         
@@ -70,19 +200,43 @@ class OrchestrationAgent:
         
     def _init_clients(self):
         """Initialize AI provider clients"""
+        
+        # One keep-alive pool per agent so every lane reuses TLS connections
+        http_kwargs: Dict[str, Any] = {}
+        if httpx:
+            http_kwargs["http_client"] = httpx.Client(limits=httpx.Limits(**_HTTP_POOL_LIMITS))
+        
         self.openai_client = None
         self.anthropic_client = None
         
-        if self.anthropic_api_key and anthropic:
-            try:
-                self.anthropic_client = anthropic.Anthropic(api_key=self.anthropic_api_key)
+        # Each credential is a separate lane with its own rate-limit cooldown
+        self._lanes: List[Dict[str, Any]] = []
+        self._provider_state: Dict[str, Dict[str, float]] = {}
+        
+        if anthropic:
+            for index, api_key in enumerate(self.anthropic_api_keys):
+                try:
+                    client = anthropic.Anthropic(api_key=api_key, **http_kwargs)
+                except Exception as e:
+                    logger.warning(f"Failed to initialize Anthropic client: {e}")
+                    continue
+                
+                name = "anthropic" if index == 0 else f"anthropic:{index}"
+                self._add_lane(
+                    name, "anthropic", client,
+                    functools.partial(anthropic.AsyncAnthropic, api_key=api_key)
+                )
+                if not self.anthropic_client:
+                    self.anthropic_client = client
                 logger.info("Initialized Anthropic client")
-            except Exception as e:
-                logger.warning(f"Failed to initialize Anthropic client: {e}")
         
         if self.openai_api_key and openai:
             try:
-                self.openai_client = openai.OpenAI(api_key=self.openai_api_key)
+                self.openai_client = openai.OpenAI(api_key=self.openai_api_key, **http_kwargs)
+                self._add_lane(
+                    "openai", "openai", self.openai_client,
+                    functools.partial(openai.AsyncOpenAI, api_key=self.openai_api_key)
+                )
                 logger.info("Initialized OpenAI client")
             except Exception as e:
                 logger.warning(f"Failed to initialize OpenAI client: {e}")
@@ -92,6 +246,25 @@ class OrchestrationAgent:
                 "No AI provider available. Please provide OPENAI_API_KEY or ANTHROPIC_API_KEY"
             )
     
+    def _add_lane(self, name: str, provider: str, client: Any, aclient_factory: Callable[..., Any]) -> None:
+        """
+        Register a provider credential as a fallback lane
+        
+        Args:
+            name: Lane name used for rate-limit bookkeeping
+            provider: "anthropic" or "openai"
+            client: Synchronous SDK client
+            aclient_factory: Builds the async SDK client; called once per event loop
+        """
+        self._lanes.append({
+            "name": name,
+            "provider": provider,
+            "client": client,
+            "aclient_factory": aclient_factory,
+            "aclients": weakref.WeakKeyDictionary(),
+        })
+        self._provider_state[name] = {"cooldown_until": 0.0, "backoff": 0.0}
+    
     def decide(
         self, 
         node: Dict[str, Any], 
@@ -109,13 +282,57 @@ class OrchestrationAgent:
         Returns:
             OrchestrationDecision with next action and reasoning
         """
-        # Convert dicts to Pydantic models for validation
-        node_obj = Node(**node) if isinstance(node, dict) else node
-        org_obj = Organisation(**organisation) if isinstance(organisation, dict) else organisation
-        policy_obj = ScanPolicy(**scan_policy) if isinstance(scan_policy, dict) else scan_policy
+        node_obj, org_obj, policy_obj = self._prepare_inputs(node, organisation, scan_policy)
         
-        # Apply business logic checks first
-        self._validate_permissions(node_obj, org_obj, policy_obj)
+        # Deterministic rules short-circuit the AI call
+        direct = self._try_direct_decision(node_obj, org_obj, policy_obj)
+        if direct:
+            return direct
+        
+        # Unchanged inputs reuse the stored AI decision
+        state_key, stored = self._stored_decision(node_obj, org_obj, policy_obj)
+        if stored:
+            return self._finalize_decision(stored, node_obj, org_obj, policy_obj)
+        
+        # Generate prompt
+        prompt = self.prompt_generator.generate_orchestration_prompt(
+            node_obj, org_obj, policy_obj
+        )
+        
+        # Get AI decision
+        decision = self._get_ai_decision(prompt)
+        self._store_decision(state_key, decision)
+        
+        return self._finalize_decision(decision, node_obj, org_obj, policy_obj)
+    
+    async def adecide(
+        self, 
+        node: Dict[str, Any], 
+        organisation: Dict[str, Any], 
+        scan_policy: Dict[str, Any]
+    ) -> OrchestrationDecision:
+        """
+        Make an orchestration decision for a node without blocking the event loop
+        
+        Args:
+            node: Node metadata dictionary
+            organisation: Organisation context dictionary  
+            scan_policy: Scan policy configuration dictionary
+            
+        Returns:
+            OrchestrationDecision with next action and reasoning
+        """
+        node_obj, org_obj, policy_obj = self._prepare_inputs(node, organisation, scan_policy)
+        
+        # Deterministic rules short-circuit the AI call
+        direct = self._try_direct_decision(node_obj, org_obj, policy_obj)
+        if direct:
+            return direct
+        
+        # Unchanged inputs reuse the stored AI decision
+        state_key, stored = self._stored_decision(node_obj, org_obj, policy_obj)
+        if stored:
+            return self._finalize_decision(stored, node_obj, org_obj, policy_obj)
         
         # Generate prompt
         prompt = self.prompt_generator.generate_orchestration_prompt(
@@ -123,20 +340,181 @@ class OrchestrationAgent:
         )
         
         # Get AI decision
-        decision_data = self._get_ai_decision(prompt)
+        decision = await self._aget_ai_decision(prompt)
+        self._store_decision(state_key, decision)
+        
+        return self._finalize_decision(decision, node_obj, org_obj, policy_obj)
+    
+    async def aclose(self) -> None:
+        """
+        Close the async provider clients opened on the running event loop
+        
+        Call before the loop finishes (e.g. at the end of the coroutine passed
+        to asyncio.run()); otherwise its clients and connections stay open.
+        """
+        loop = asyncio.get_running_loop()
+        for lane in self._lanes:
+            aclient = lane["aclients"].pop(loop, None)
+            if aclient is not None:
+                await aclient.close()
+    
+    def decide_many(
+        self,
+        nodes: List[Dict[str, Any]],
+        organisation: Dict[str, Any],
+        scan_policy: Dict[str, Any],
+        batch_size: int = 10
+    ) -> List[OrchestrationDecision]:
+        """
+        Make orchestration decisions for many nodes of one organisation
+        
+        Nodes needing the AI are packed batch_size at a time into a single
+        prompt, so N nodes cost roughly N / batch_size provider calls.
+        
+        Args:
+            nodes: Node metadata dictionaries
+            organisation: Organisation context dictionary
+            scan_policy: Scan policy configuration dictionary
+            batch_size: Maximum number of nodes per AI request; capped so a
+                batch's output allowance stays within the model's output limit
+            
+        Returns:
+            Decisions in the same order as nodes
+            
+        Raises:
+            ValueError: If batch_size is less than 1
+        """
+        if batch_size < 1:
+            raise ValueError(f"batch_size must be at least 1, got {batch_size}")
+        batch_size = min(batch_size, _MAX_BATCH_SIZE)
+        
+        org_obj = Organisation.from_untrusted(organisation) if isinstance(organisation, dict) else organisation
+        policy_obj = _to_scan_policy(scan_policy)
+        
+        decisions: List[Optional[OrchestrationDecision]] = [None] * len(nodes)
+        pending: List[Tuple[int, Node]] = []
+        state_keys: Dict[int, bytes] = {}
+        
+        for index, node in enumerate(nodes):
+            node_obj, _, _ = self._prepare_inputs(node, org_obj, policy_obj)
+            direct = self._try_direct_decision(node_obj, org_obj, policy_obj)
+            if direct:
+                decisions[index] = direct
+                continue
+            
+            state_key, stored = self._stored_decision(node_obj, org_obj, policy_obj)
+            if stored:
+                decisions[index] = self._finalize_decision(stored, node_obj, org_obj, policy_obj)
+                continue
+            if state_key:
+                state_keys[index] = state_key
+            pending.append((index, node_obj))
+        
+        for start in range(0, len(pending), batch_size):
+            batch = pending[start:start + batch_size]
+            prompt = self.prompt_generator.generate_batch_orchestration_prompt(
+                [node_obj for _, node_obj in batch], org_obj, policy_obj
+            )
+            response = self._get_ai_decision(prompt, batch_size=len(batch))
+            
+            by_index = {item.index: item for item in response.decisions}
+            
+            for position, (index, node_obj) in enumerate(batch):
+                item = by_index.get(position)
+                if item is None:
+                    # Ask again individually rather than guess for the missing node
+                    logger.warning(f"Batch response missing decision for node {node_obj.id}, retrying singly")
+                    decision = self._get_ai_decision(
+                        self.prompt_generator.generate_orchestration_prompt(node_obj, org_obj, policy_obj)
+                    )
+                else:
+                    # Already validated; drop the batch-only index field
+                    decision = OrchestrationDecision.from_trusted(
+                        {name: getattr(item, name) for name in OrchestrationDecision.model_fields}
+                    )
+                self._store_decision(state_keys.get(index), decision)
+                decisions[index] = self._finalize_decision(decision, node_obj, org_obj, policy_obj)
+        
+        # Every slot was filled by a direct, stored or AI decision above
+        return cast(List[OrchestrationDecision], decisions)
+    
+    def _prepare_inputs(
+        self, 
+        node: Union[Dict[str, Any], Node], 
+        organisation: Union[Dict[str, Any], Organisation], 
+        scan_policy: Union[Dict[str, Any], ScanPolicy]
+    ) -> Tuple[Node, Organisation, ScanPolicy]:
+        """Convert inputs to models and check permissions"""
+        
+        # Convert dicts to Pydantic models for validation
+        node_obj = Node.from_untrusted(node) if isinstance(node, dict) else node
+        org_obj = Organisation.from_untrusted(organisation) if isinstance(organisation, dict) else organisation
+        policy_obj = _to_scan_policy(scan_policy)
+        
+        # Apply business logic checks first
+        self._validate_permissions(node_obj, org_obj, policy_obj)
+        
+        return node_obj, org_obj, policy_obj
+    
+    def _try_direct_decision(
+        self,
+        node: Node,
+        org: Organisation,
+        policy: ScanPolicy
+    ) -> Optional[OrchestrationDecision]:
+        """Return a rule-based decision when the outcome does not need the AI"""
+        
+        decision = None
+        
+        # Nodes inside the cooldown window are always skipped
+        last_scan_epoch = node.last_scan_epoch
+        if last_scan_epoch is not None:
+            if time.time() - last_scan_epoch < policy.scan_cooldown_seconds:
+                decision = OrchestrationDecision(
+                    next_action=NextAction.SKIP,
+                    scan_level=None,
+                    reasoning=f"Node is within the {policy.scan_cooldown_hours} hour scan cooldown period",
+                    confidence=1.0
+                )
         
-        # Validate and return decision
-        decision = OrchestrationDecision(**decision_data)
-        self._validate_decision(decision, node_obj, org_obj, policy_obj)
+        # New nodes that exhausted discovery attempts need a human
+        if (
+            decision is None
+            and policy.require_discovery
+            and node.status == NodeStatus.NEW
+            and node.discovery_attempts >= policy.max_discovery_attempts
+        ):
+            decision = OrchestrationDecision(
+                next_action=NextAction.MANUAL_REVIEW,
+                scan_level=None,
+                reasoning=f"Discovery failed after {node.discovery_attempts} attempts",
+                confidence=1.0
+            )
+        
+        if decision:
+            logger.info(f"Orchestration decision for node {node.id}: {decision.next_action} (rule-based)")
+        
+        return decision
+    
+    def _finalize_decision(
+        self,
+        decision: OrchestrationDecision,
+        node: Node,
+        org: Organisation,
+        policy: ScanPolicy
+    ) -> OrchestrationDecision:
+        """Apply business rules to a validated AI decision"""
+        
+        decision = self._validate_decision(decision, node, org, policy)
         
-        logger.info(f"Orchestration decision for node {node_obj.id}: {decision.next_action}")
+        logger.info(f"Orchestration decision for node {node.id}: {decision.next_action}")
         return decision
     
     def _validate_permissions(self, node: Node, org: Organisation, policy: ScanPolicy):
         """Validate permissions before making decision"""
         
         # Check if host is blacklisted
-        if node.host in org.blacklisted_hosts:
+        if node.host.lower() in org.blacklisted_hosts:
             raise PermissionDeniedError(f"Host {node.host} is blacklisted for organisation {org.id}")
         
         # Check protocol whitelist if configured
@@ -146,95 +524,355 @@ class OrchestrationAgent:
                     f"Protocol {node.protocol} not whitelisted for organisation {org.id}"
                 )
     
-    def _validate_decision(self, decision: OrchestrationDecision, node: Node, org: Organisation, policy: ScanPolicy):
-        """Validate the AI decision against business rules"""
+    def _validate_decision(
+        self,
+        decision: OrchestrationDecision,
+        node: Node,
+        org: Organisation,
+        policy: ScanPolicy
+    ) -> OrchestrationDecision:
+        """
+        Validate the AI decision against business rules
+        
+        Returns:
+            The decision, or an adjusted copy if a rule overrode it
+        """
+        
+        next_action = decision.next_action
+        scan_level = decision.scan_level
         
         # Check ferocious scan permissions
-        if decision.scan_level == "ferocious" and not org.ferocious_enabled:
+        if scan_level == ScanLevel.FEROCIOUS and not org.ferocious_enabled:
             logger.warning(f"AI recommended ferocious scan but org {org.id} lacks permission, downgrading to medium")
-            decision.scan_level = "medium"
-            decision.next_action = "scan_medium"
+            scan_level = ScanLevel.MEDIUM
+            next_action = NextAction.SCAN_MEDIUM
         
         # Check scan cooldown
-        if node.last_scan_time and decision.next_action.startswith("scan_"):
-            cooldown_delta = timedelta(hours=policy.scan_cooldown_hours)
-            if datetime.utcnow() - node.last_scan_time < cooldown_delta:
+        last_scan_epoch = node.last_scan_epoch
+        if last_scan_epoch is not None and next_action.startswith("scan_"):
+            if time.time() - last_scan_epoch < policy.scan_cooldown_seconds:
                 logger.info(f"Node {node.id} in cooldown period, skipping scan")
-                decision.next_action = "skip"
-                decision.scan_level = None
+                next_action = NextAction.SKIP
+                scan_level = None
         
         # Enforce maximum escalation policy
-        escalation_order = {"light": 1, "medium": 2, "ferocious": 3}
+        escalation_order = {ScanLevel.LIGHT: 1, ScanLevel.MEDIUM: 2, ScanLevel.FEROCIOUS: 3}
         max_level = escalation_order.get(policy.max_escalation, 2)
         
-        if decision.scan_level and escalation_order.get(decision.scan_level, 1) > max_level:
+        if scan_level and escalation_order.get(scan_level, 1) > max_level:
             # Downgrade to maximum allowed level
             for level, order in escalation_order.items():
                 if order == max_level:
-                    decision.scan_level = level
-                    decision.next_action = f"scan_{level}"
+                    scan_level = level
+                    next_action = NextAction(f"scan_{level}")
                     break
+        
+        if next_action == decision.next_action and scan_level == decision.scan_level:
+            return decision
+        return decision.model_copy(update={"next_action": next_action, "scan_level": scan_level})
+    
+    def _stored_decision(
+        self,
+        node: Node,
+        org: Organisation,
+        policy: ScanPolicy
+    ) -> Tuple[Optional[bytes], Optional[OrchestrationDecision]]:
+        """
+        Look up the persisted AI decision for these inputs
+        
+        Returns:
+            (state key, stored decision); both None without a decision cache
+        """
+        if not self.decision_cache:
+            return None, None
+        state_key = self.decision_cache.state_key(node, org, policy)
+        return state_key, self.decision_cache.get(state_key)
+    
+    def _store_decision(self, state_key: Optional[bytes], decision: OrchestrationDecision) -> None:
+        """Persist an AI decision under the state key from _stored_decision"""
+        if state_key and self.decision_cache:
+            self.decision_cache.put(state_key, decision)
+    
+    def _cache_key(self, prompt: str) -> Optional[str]:
+        """Cache key for a prompt, or None if caching is disabled for it"""
+        if not self.cache:
+            return None
+        return self.cache.cache_key(
+            f"{self.anthropic_model}|{self.openai_model}", prompt, self.temperature
+        )
+    
+    @overload
+    def _get_ai_decision(self, prompt: str) -> OrchestrationDecision: ...
+    
+    @overload
+    def _get_ai_decision(self, prompt: str, batch_size: int) -> BatchDecisionResponse: ...
+    
+    def _get_ai_decision(self, prompt: str, batch_size: Optional[int] = None) -> AIResponse:
+        """Get decision from cache or AI provider; a batch_size asks for a batch response"""
+        
+        cache_key = self._cache_key(prompt)
+        if cache_key and self.cache:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                self.cache_hits += 1
+                return _from_cache(cached, batch_size)
+            self.cache_misses += 1
+        
+        response = self._request_ai_decision(prompt, batch_size)
+        
+        if cache_key and self.cache:
+            self.cache.set(cache_key, _cache_payload(response))
+        
+        return response
+    
+    @overload
+    async def _aget_ai_decision(self, prompt: str) -> OrchestrationDecision: ...
+    
+    @overload
+    async def _aget_ai_decision(self, prompt: str, batch_size: int) -> BatchDecisionResponse: ...
+    
+    async def _aget_ai_decision(self, prompt: str, batch_size: Optional[int] = None) -> AIResponse:
+        """Get decision from cache or AI provider asynchronously; a batch_size asks for a batch response"""
+        
+        cache_key = self._cache_key(prompt)
+        if cache_key and self.cache:
+            cached = await self.cache.aget(cache_key)
+            if cached is not None:
+                self.cache_hits += 1
+                return _from_cache(cached, batch_size)
+            self.cache_misses += 1
+        
+        response = await self._arequest_ai_decision(prompt, batch_size)
+        
+        if cache_key and self.cache:
+            await self.cache.aset(cache_key, _cache_payload(response))
+        
+        return response
     
-    def _get_ai_decision(self, prompt: str) -> Dict[str, Any]:
+    def _request_ai_decision(self, prompt: str, batch_size: Optional[int] = None) -> AIResponse:
         """Get decision from AI provider with fallback"""
         
-        # Try Anthropic first if available
-        if self.anthropic_client:
+        last_error = None
+        for lane in self._ready_lanes():
             try:
-                return self._call_anthropic(prompt)
+                if lane["provider"] == "anthropic":
+                    result = self._call_anthropic(prompt, lane["client"], batch_size)
+                else:
+                    result = self._call_openai(prompt, lane["client"], batch_size)
             except Exception as e:
-                logger.warning(f"Anthropic call failed: {e}")
-                if not self.enable_fallback or not self.openai_client:
-                    raise AIProviderError(f"Anthropic call failed: {e}")
+                last_error = e
+                self._record_lane_failure(lane, e)
+                continue
+            
+            self._provider_state[lane["name"]]["backoff"] = 0.0
+            return result
+        
+        self._raise_no_decision(last_error)
+    
+    async def _arequest_ai_decision(self, prompt: str, batch_size: Optional[int] = None) -> AIResponse:
+        """Get decision from AI provider with fallback asynchronously"""
         
-        # Fall back to OpenAI
-        if self.openai_client:
+        last_error = None
+        for lane in self._ready_lanes():
             try:
-                return self._call_openai(prompt)
+                if lane["provider"] == "anthropic":
+                    result = await self._acall_anthropic(prompt, self._async_client(lane), batch_size)
+                else:
+                    result = await self._acall_openai(prompt, self._async_client(lane), batch_size)
             except Exception as e:
-                logger.error(f"OpenAI call failed: {e}")
-                raise AIProviderError(f"OpenAI call failed: {e}")
+                last_error = e
+                self._record_lane_failure(lane, e)
+                continue
+            
+            self._provider_state[lane["name"]]["backoff"] = 0.0
+            return result
         
-        raise AIProviderError("No AI provider available")
+        self._raise_no_decision(last_error)
     
-    def _call_anthropic(self, prompt: str) -> Dict[str, Any]:
-        """Call Anthropic API"""
-        logger.debug("Calling Anthropic API")
+    def _async_client(self, lane: Dict[str, Any]) -> Any:
+        """
+        Async SDK client of a lane for the running event loop
         
-        response = self.anthropic_client.messages.create(
-            model=self.anthropic_model,
-            max_tokens=1024,
-            temperature=self.temperature,
-            system="You are an infrastructure orchestration agent. Output must be valid JSON that matches the required schema exactly.",
-            messages=[{"role": "user", "content": prompt}]
-        )
+        httpx async pools are bound to the loop that opened them, so each
+        loop gets its own client (and pool). Open connections keep the loop
+        alive, so the client stays cached until aclose() runs on that loop.
+        """
+        loop = asyncio.get_running_loop()
+        aclients = lane["aclients"]
+        aclient = aclients.get(loop)
+        if aclient is None:
+            http_kwargs: Dict[str, Any] = {}
+            if httpx:
+                http_kwargs["http_client"] = httpx.AsyncClient(limits=httpx.Limits(**_HTTP_POOL_LIMITS))
+            aclient = aclients[loop] = lane["aclient_factory"](**http_kwargs)
+        return aclient
+    
+    def _first_lane(self, provider: str) -> Dict[str, Any]:
+        """First registered lane of a provider"""
+        for lane in self._lanes:
+            if lane["provider"] == provider:
+                return lane
+        raise AIProviderError(f"No {provider} client configured")
+    
+    def _ready_lanes(self) -> List[Dict[str, Any]]:
+        """Provider lanes to try, in order, skipping those cooling down after a rate limit"""
+        
+        lanes = self._lanes
+        if not self.enable_fallback and lanes:
+            # Without fallback only the primary provider's credentials are used
+            lanes = [lane for lane in lanes if lane["provider"] == lanes[0]["provider"]]
         
-        text = response.content[0].text.strip()
+        now = time.monotonic()
+        ready = []
+        for lane in lanes:
+            if now < self._provider_state[lane["name"]]["cooldown_until"]:
+                logger.debug(f"Skipping rate-limited provider {lane['name']}")
+                continue
+            ready.append(lane)
+        return ready
+    
+    def _record_lane_failure(self, lane: Dict[str, Any], error: Exception) -> None:
+        """Put a rate-limited lane into cooldown, or stop if fallback is disabled"""
+        
+        provider = "Anthropic" if lane["provider"] == "anthropic" else "OpenAI"
         
-        # Clean up potential markdown formatting
-        if text.startswith("```json"):
-            text = text[7:]
-        if text.endswith("```"):
-            text = text[:-3]
+        if _is_rate_limit_error(error):
+            state = self._provider_state[lane["name"]]
+            state["backoff"] = min(
+                max(state["backoff"] * 2, _RATE_LIMIT_BACKOFF_INITIAL), _RATE_LIMIT_BACKOFF_MAX
+            )
+            state["cooldown_until"] = time.monotonic() + state["backoff"]
+            logger.warning(f"{provider} rate limited ({lane['name']}), cooling down for {state['backoff']:.0f}s")
+            return
         
-        return json.loads(text.strip())
+        logger.warning(f"{provider} call failed: {error}")
+        if not self.enable_fallback:
+            raise AIProviderError(f"{provider} call failed: {error}")
     
-    def _call_openai(self, prompt: str) -> Dict[str, Any]:
-        """Call OpenAI API"""
-        logger.debug("Calling OpenAI API")
+    def _raise_no_decision(self, last_error: Optional[Exception]) -> NoReturn:
+        """Raise once every provider lane failed or was skipped"""
+        if last_error is not None:
+            logger.error(f"All AI providers failed, last error: {last_error}")
+            raise AIProviderError(f"AI provider call failed: {last_error}")
+        raise AIProviderError("No AI provider available (all providers rate limited)")
+    
+    def _anthropic_request(self, prompt: str, batch_size: Optional[int] = None) -> Dict[str, Any]:
+        """Build Anthropic messages request arguments"""
+        
+        # Forcing a tool call makes the model return the decision as structured input
+        tool = _BATCH_DECISION_TOOL if batch_size else _DECISION_TOOL
+        
+        # Mark the static prefix as a cache breakpoint so repeat calls reuse it
+        prefix, tail = self.prompt_generator.split_prefix(prompt)
+        if prefix:
+            content: Any = [
+                {"type": "text", "text": prefix, "cache_control": {"type": "ephemeral"}},
+                {"type": "text", "text": tail}
+            ]
+        else:
+            content = prompt
+        
+        return {
+            "model": self.anthropic_model,
+            "max_tokens": min(_MAX_TOKENS_PER_DECISION * (batch_size or 1), _MAX_OUTPUT_TOKENS),
+            "temperature": self.temperature,
+            "system": _SYS_PROMPT,
+            "messages": [{"role": "user", "content": content}],
+            "tools": [tool],
+            "tool_choice": {"type": "tool", "name": tool["name"]}
+        }
+    
+    def _parse_anthropic_response(self, response: Any, batch_size: Optional[int] = None) -> AIResponse:
+        """Validate the decision from the forced tool call of an Anthropic response"""
+        usage = getattr(response, "usage", None)
+        if usage is not None:
+            logger.debug(
+                f"Anthropic prompt cache: read={getattr(usage, 'cache_read_input_tokens', None)} "
+                f"created={getattr(usage, 'cache_creation_input_tokens', None)}"
+            )
+        
+        for block in response.content:
+            if block.type == "tool_use":
+                decision: AIResponse = _response_adapter(batch_size).validate_python(block.input)
+                return decision
+        
+        raise AIProviderError("Anthropic response did not contain a decision tool call")
+    
+    def _call_anthropic(
+        self, prompt: str, client: Any = None, batch_size: Optional[int] = None
+    ) -> AIResponse:
+        """Call Anthropic API"""
+        logger.debug("Calling Anthropic API")
+        
+        client = client or self.anthropic_client
+        response = client.messages.create(**self._anthropic_request(prompt, batch_size))
+        return self._parse_anthropic_response(response, batch_size)
+    
+    async def _acall_anthropic(
+        self, prompt: str, client: Any = None, batch_size: Optional[int] = None
+    ) -> AIResponse:
+        """Call Anthropic API asynchronously"""
+        logger.debug("Calling Anthropic API")
         
-        response = self.openai_client.chat.completions.create(
-            model=self.openai_model,
-            temperature=self.temperature,
-            messages=[
+        client = client or self._async_client(self._first_lane("anthropic"))
+        response = await client.messages.create(**self._anthropic_request(prompt, batch_size))
+        return self._parse_anthropic_response(response, batch_size)
+    
+    def _openai_request(self, prompt: str) -> Dict[str, Any]:
+        """Build OpenAI chat completion request arguments"""
+        return {
+            "model": self.openai_model,
+            "temperature": self.temperature,
+            "messages": [
                 {
                     "role": "system", 
-                    "content": "You are an infrastructure orchestration agent. Output must be valid JSON that matches the required schema exactly."
+                    "content": _SYS_PROMPT
                 },
                 {"role": "user", "content": prompt}
             ],
-            response_format={"type": "json_object"}
-        )
+            "response_format": {"type": "json_object"}
+        }
+    
+    def _parse_openai_response(self, response: Any, batch_size: Optional[int] = None) -> AIResponse:
+        """Parse and validate the decision JSON of an OpenAI response"""
+        details = getattr(getattr(response, "usage", None), "prompt_tokens_details", None)
+        if details is not None:
+            logger.debug(f"OpenAI prompt cache: cached_tokens={getattr(details, 'cached_tokens', None)}")
+        
+        content = response.choices[0].message.content
+        if batch_size:
+            return BatchDecisionResponse(decisions=self.prompt_generator.parse_batch_response(content))
+        return _DECISION_ADAPTER.validate_json(content)
+    
+    def _call_openai(
+        self, prompt: str, client: Any = None, batch_size: Optional[int] = None
+    ) -> AIResponse:
+        """Call OpenAI API"""
+        logger.debug("Calling OpenAI API")
+        
+        client = client or self.openai_client
+        response = client.chat.completions.create(**self._openai_request(prompt))
+        return self._parse_openai_response(response, batch_size)
+    
+    async def _acall_openai(
+        self, prompt: str, client: Any = None, batch_size: Optional[int] = None
+    ) -> AIResponse:
+        """Call OpenAI API asynchronously"""
+        logger.debug("Calling OpenAI API")
         
-        text = response.choices[0].message.content.strip()
-        return json.loads(text)
+        client = client or self._async_client(self._first_lane("openai"))
+        response = await client.chat.completions.create(**self._openai_request(prompt))
+        return self._parse_openai_response(response, batch_size)
+
+@functools.lru_cache(maxsize=1)
+def get_default_agent() -> OrchestrationAgent:
+    """
+    Process-wide OrchestrationAgent configured from the environment
+    
+    Reusing one agent keeps its provider connection pools warm across
+    callers; the underlying SDK clients are thread-safe. Async clients are
+    created per event loop, so the agent is safe to share across repeated
+    asyncio.run() calls, but connections are only reused within one loop;
+    await agent.aclose() before each loop ends to release its clients.
+    """
+    return OrchestrationAgent()
@@ -0,0 +1,282 @@
+"""
+Response caching for AI orchestration decisions
+"""
+
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Tuple
+
+import orjson
+
+from .models import Node, Organisation, ScanPolicy, OrchestrationDecision
+from .prompts import prompt_key
+
+try:
+    import redis
+    import redis.asyncio
+except ImportError:
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+class CacheBackend:
+    """Storage backend for cached AI responses"""
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached value for key, or None if missing or expired"""
+        raise NotImplementedError
+
+    def set(self, key: str, value: Dict[str, Any], ttl: Optional[float] = None) -> None:
+        """Store value under key, expiring after ttl seconds if given"""
+        raise NotImplementedError
+
+    async def aget(self, key: str) -> Optional[Dict[str, Any]]:
+        """Asynchronous get; defaults to the synchronous implementation"""
+        return self.get(key)
+
+    async def aset(self, key: str, value: Dict[str, Any], ttl: Optional[float] = None) -> None:
+        """Asynchronous set; defaults to the synchronous implementation"""
+        self.set(key, value, ttl)
+
+class InMemoryLRU(CacheBackend):
+    """Process-local LRU cache with per-entry expiry"""
+
+    def __init__(self, maxsize: int = 1024):
+        """
+        Initialize in-memory cache
+
+        Args:
+            maxsize: Maximum number of entries kept before evicting the least recently used
+        """
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, Tuple[Optional[float], Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            expires_at, value = entry
+            if expires_at is not None and time.monotonic() >= expires_at:
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Dict[str, Any], ttl: Optional[float] = None) -> None:
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all cached entries"""
+        with self._lock:
+            self._entries.clear()
+
+class RedisBackend(CacheBackend):
+    """Redis-backed cache shared between processes"""
+
+    def __init__(self, url: str = "redis://localhost:6379/0", prefix: str = "pgdn-orchestrator:"):
+        """
+        Initialize Redis cache
+
+        Args:
+            url: Redis connection URL
+            prefix: Prefix applied to every cache key
+        """
+        if redis is None:
+            raise ImportError("RedisBackend requires the 'redis' package")
+
+        self.url = url
+        self.prefix = prefix
+        self.client = redis.Redis.from_url(url)
+        self.aclient = redis.asyncio.Redis.from_url(url)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        raw = self.client.get(self.prefix + key)
+        if raw is None:
+            return None
+        value: Dict[str, Any] = orjson.loads(raw)
+        return value
+
+    def set(self, key: str, value: Dict[str, Any], ttl: Optional[float] = None) -> None:
+        self.client.set(
+            self.prefix + key,
+            orjson.dumps(value),
+            px=int(ttl * 1000) if ttl else None
+        )
+
+    async def aget(self, key: str) -> Optional[Dict[str, Any]]:
+        raw = await self.aclient.get(self.prefix + key)
+        if raw is None:
+            return None
+        value: Dict[str, Any] = orjson.loads(raw)
+        return value
+
+    async def aset(self, key: str, value: Dict[str, Any], ttl: Optional[float] = None) -> None:
+        await self.aclient.set(
+            self.prefix + key,
+            orjson.dumps(value),
+            px=int(ttl * 1000) if ttl else None
+        )
+
+class LLMCache:
+    """Exact-match cache for AI provider responses"""
+
+    def __init__(
+        self,
+        backend: Optional[CacheBackend] = None,
+        ttl: Optional[float] = 3600.0,
+        cache_nonzero_temperature: bool = False
+    ):
+        """
+        Initialize LLM response cache
+
+        Args:
+            backend: Storage backend (defaults to an in-memory LRU)
+            ttl: Seconds before a cached response expires (None to never expire)
+            cache_nonzero_temperature: Cache responses sampled at temperature > 0
+        """
+        self.backend = backend or InMemoryLRU()
+        self.ttl = ttl
+        self.cache_nonzero_temperature = cache_nonzero_temperature
+
+    def cache_key(self, model: str, prompt: str, temperature: float) -> Optional[str]:
+        """
+        Build the cache key for a request
+
+        Returns:
+            Hex digest identifying the request, or None if it should not be cached
+        """
+        if temperature > 0.0 and not self.cache_nonzero_temperature:
+            return None
+
+        payload = orjson.dumps(
+            {"m": model, "p": prompt, "t": temperature}, option=orjson.OPT_SORT_KEYS
+        )
+        return hashlib.sha256(payload).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Look up a cached response, treating backend failures as a miss"""
+        try:
+            return self.backend.get(key)
+        except Exception as e:
+            logger.warning(f"Cache lookup failed: {e}")
+            return None
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        """Store a response, ignoring backend failures"""
+        try:
+            self.backend.set(key, value, self.ttl)
+        except Exception as e:
+            logger.warning(f"Cache store failed: {e}")
+
+    async def aget(self, key: str) -> Optional[Dict[str, Any]]:
+        """Asynchronous cache lookup, treating backend failures as a miss"""
+        try:
+            return await self.backend.aget(key)
+        except Exception as e:
+            logger.warning(f"Cache lookup failed: {e}")
+            return None
+
+    async def aset(self, key: str, value: Dict[str, Any]) -> None:
+        """Asynchronously store a response, ignoring backend failures"""
+        try:
+            await self.backend.aset(key, value, self.ttl)
+        except Exception as e:
+            logger.warning(f"Cache store failed: {e}")
+
+class DecisionCache:
+    """On-disk cache of AI decisions keyed by the node, organisation and policy state"""
+
+    def __init__(self, path: str = "pgdn_decisions.sqlite3", ttl: float = 3600.0):
+        """
+        Initialize SQLite decision cache
+
+        Args:
+            path: SQLite database file (shared safely between processes via WAL)
+            ttl: Seconds before a stored decision expires
+        """
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self.db = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS decisions ("
+            "key BLOB PRIMARY KEY, decision BLOB NOT NULL, expires_at REAL NOT NULL)"
+        )
+
+    @staticmethod
+    def state_key(node: Node, organisation: Organisation, scan_policy: ScanPolicy) -> bytes:
+        """
+        Build the cache key for a decision input
+
+        Built from the same projections the prompt is rendered from, so any
+        change that could alter the AI's answer yields a new key and stale
+        entries simply expire. The projections are ordered tuples, which keeps
+        the key stable across processes.
+        """
+        payload = orjson.dumps(prompt_key(node, organisation, scan_policy))
+        return hashlib.blake2b(payload, digest_size=16).digest()
+
+    def get(self, key: bytes) -> Optional[OrchestrationDecision]:
+        """Look up a stored decision, treating expiry, database failures and unreadable rows as a miss"""
+        try:
+            with self._lock:
+                row = self.db.execute(
+                    "SELECT decision, expires_at FROM decisions WHERE key = ?", (key,)
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Decision cache lookup failed: {e}")
+            return None
+
+        if row is None:
+            return None
+
+        decision, expires_at = row
+        if expires_at <= time.time():
+            return None
+        try:
+            return OrchestrationDecision.from_trusted(orjson.loads(decision))
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            # Corrupt rows, or rows written under an older decision schema
+            logger.warning(f"Decision cache entry unreadable: {e}")
+            return None
+
+    def put(self, key: bytes, decision: OrchestrationDecision, ttl_s: Optional[float] = None) -> None:
+        """Store a decision, ignoring database failures"""
+        ttl = self.ttl if ttl_s is None else ttl_s
+        payload = orjson.dumps(decision.model_dump(mode="json", exclude={"ts_ns", "timestamp"}))
+        try:
+            with self._lock:
+                self.db.execute(
+                    "INSERT OR REPLACE INTO decisions (key, decision, expires_at) VALUES (?, ?, ?)",
+                    (key, payload, time.time() + ttl)
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"Decision cache store failed: {e}")
+
+    def purge_expired(self) -> None:
+        """Delete expired entries, ignoring database failures"""
+        try:
+            with self._lock:
+                self.db.execute("DELETE FROM decisions WHERE expires_at <= ?", (time.time(),))
+        except sqlite3.Error as e:
+            logger.warning(f"Decision cache purge failed: {e}")
+
+    def close(self) -> None:
+        """Close the database connection"""
+        with self._lock:
+            self.db.close()
@@ -3,10 +3,33 @@ Configuration management for pgdn-orchestrator
 """
 
 import os
+import copy
 import json
+import functools
 from typing import Dict, Any, Optional
 from pathlib import Path
 
+import orjson
+
+# (environment variable, config path, type conversion)
+_ENV_OVERRIDES = (
+    # AI provider settings
+    ("ORCHESTRATION_TEMPERATURE", ("ai_provider", "temperature"), float),
+    ("OPENAI_MODEL", ("ai_provider", "openai_model"), str),
+    ("ANTHROPIC_MODEL", ("ai_provider", "anthropic_model"), str),
+    # Scan policy settings
+    ("ORCHESTRATION_MAX_ESCALATION", ("scan_policy", "max_escalation"), str),
+    ("ORCHESTRATION_SCAN_COOLDOWN", ("scan_policy", "scan_cooldown_hours"), int),
+    # pgdn integration
+    ("PGDN_BINARY_PATH", ("pgdn_integration", "binary_path"), str),
+)
+
+@functools.lru_cache(maxsize=32)
+def _read_config_file(path: str, mtime_ns: int) -> Dict[str, Any]:
+    """Parse a config file; cached until the file's modification time changes"""
+    with open(path, "rb") as f:
+        return orjson.loads(f.read())
+
 class ConfigManager:
     """Manages configuration for orchestration"""
     
@@ -42,19 +65,27 @@ class ConfigManager:
         """
         self.config_path = config_path
         self.config = self._load_config()
+        self._get_cache: Dict[str, Any] = {}
+    
+    def reload(self):
+        """Reload configuration from file and environment"""
+        self.config = self._load_config()
+        self._get_cache.clear()
     
     def _load_config(self) -> Dict[str, Any]:
         """Load configuration from file or environment"""
-        config = self.DEFAULT_CONFIG.copy()
+        config = copy.deepcopy(self.DEFAULT_CONFIG)
         
         # Load from file if provided
         if self.config_path:
             file_path = Path(self.config_path)
             if file_path.exists():
                 try:
-                    with open(file_path) as f:
-                        file_config = json.load(f)
-                    self._deep_update(config, file_config)
+                    file_config = _read_config_file(
+                        str(file_path.resolve()), file_path.stat().st_mtime_ns
+                    )
+                    # Copy so the cached parse is never mutated through self.config
+                    self._deep_update(config, copy.deepcopy(file_config))
                 except Exception as e:
                     print(f"Warning: Failed to load config file {self.config_path}: {e}")
         
@@ -65,32 +96,27 @@ class ConfigManager:
     
     def _deep_update(self, base: Dict[str, Any], updates: Dict[str, Any]):
         """Deep update dictionary"""
-        for key, value in updates.items():
-            if key in base and isinstance(base[key], dict) and isinstance(value, dict):
-                self._deep_update(base[key], value)
-            else:
-                base[key] = value
+        stack = [(base, updates)]
+        while stack:
+            target, source = stack.pop()
+            for key, value in source.items():
+                if key in target and isinstance(target[key], dict) and isinstance(value, dict):
+                    stack.append((target[key], value))
+                else:
+                    target[key] = value
     
     def _load_env_overrides(self, config: Dict[str, Any]):
         """Load configuration overrides from environment variables"""
-        
-        # AI provider settings
-        if os.getenv("ORCHESTRATION_TEMPERATURE"):
-            config["ai_provider"]["temperature"] = float(os.getenv("ORCHESTRATION_TEMPERATURE"))
-        if os.getenv("OPENAI_MODEL"):
-            config["ai_provider"]["openai_model"] = os.getenv("OPENAI_MODEL")
-        if os.getenv("ANTHROPIC_MODEL"):
-            config["ai_provider"]["anthropic_model"] = os.getenv("ANTHROPIC_MODEL")
-        
-        # Scan policy settings
-        if os.getenv("ORCHESTRATION_MAX_ESCALATION"):
-            config["scan_policy"]["max_escalation"] = os.getenv("ORCHESTRATION_MAX_ESCALATION")
-        if os.getenv("ORCHESTRATION_SCAN_COOLDOWN"):
-            config["scan_policy"]["scan_cooldown_hours"] = int(os.getenv("ORCHESTRATION_SCAN_COOLDOWN"))
-        
-        # pgdn integration
-        if os.getenv("PGDN_BINARY_PATH"):
-            config["pgdn_integration"]["binary_path"] = os.getenv("PGDN_BINARY_PATH")
+        environ = os.environ
+        for env_var, path, cast in _ENV_OVERRIDES:
+            value = environ.get(env_var)
+            if not value:
+                continue
+            
+            section = config
+            for key in path[:-1]:
+                section = section[key]
+            section[path[-1]] = cast(value)
     
     def get(self, key_path: str, default: Any = None) -> Any:
         """
@@ -103,15 +129,22 @@ class ConfigManager:
         Returns:
             Configuration value or default
         """
+        try:
+            return self._get_cache[key_path]
+        except KeyError:
+            pass
+        
         keys = key_path.split(".")
         value = self.config
         
         try:
             for key in keys:
                 value = value[key]
-            return value
         except (KeyError, TypeError):
             return default
+        
+        self._get_cache[key_path] = value
+        return value
     
     def save(self, output_path: Optional[str] = None):
         """
@@ -124,5 +157,7 @@ class ConfigManager:
         if not save_path:
             raise ValueError("No output path specified")
         
+        self._get_cache.clear()
+        
         with open(save_path, 'w') as f:
             json.dump(self.config, f, indent=2)
@@ -0,0 +1,324 @@
+# pgdn_orchestrator/integration.py
+"""
+Integration helpers for pgdn command line tool
+"""
+
+import asyncio
+import subprocess
+import json
+import logging
+from typing import Dict, Any, Optional, List, Tuple
+from pathlib import Path
+
+from .agent import OrchestrationAgent, get_default_agent
+from .models import NextAction, OrchestrationDecision, Organisation
+
+logger = logging.getLogger(__name__)
+
+# Argument prefix (up to --target) and suffix (up to --org-id) per decision
+CommandTemplate = Tuple[Tuple[str, ...], Tuple[str, ...]]
+
+class PgdnIntegration:
+    """Integration layer for pgdn command line tool"""
+    
+    def __init__(self, pgdn_binary: str = "pgdn", agent: Optional[OrchestrationAgent] = None):
+        """
+        Initialize integration
+        
+        Args:
+            pgdn_binary: Path to pgdn binary (default: "pgdn")
+            agent: Orchestration agent to use (defaults to the shared process-wide agent)
+        """
+        self.pgdn_binary = pgdn_binary
+        self.agent = agent or get_default_agent()
+        self._cmd_templates = self._build_cmd_templates(pgdn_binary)
+    
+    def orchestrate_and_execute(
+        self,
+        target: str,
+        org_id: str,
+        node_data: Optional[Dict[str, Any]] = None,
+        org_data: Optional[Dict[str, Any]] = None,
+        policy_data: Optional[Dict[str, Any]] = None,
+        dry_run: bool = False,
+        additional_args: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Make orchestration decision and optionally execute pgdn command
+        
+        Args:
+            target: Target host/IP
+            org_id: Organisation ID
+            node_data: Node metadata (will create defaults if None)
+            org_data: Organisation data (will create defaults if None)  
+            policy_data: Scan policy (will create defaults if None)
+            dry_run: If True, only return decision without executing
+            additional_args: Additional arguments to pass to pgdn
+            
+        Returns:
+            Dict containing decision and execution results
+        """
+        node_data, org_data, policy_data = self._resolve_inputs(
+            target, org_id, node_data, org_data, policy_data
+        )
+        
+        # Make orchestration decision
+        decision = self.agent.decide(node_data, org_data, policy_data)
+        
+        result = self._new_result(decision, target, org_id)
+        
+        if dry_run:
+            return result
+        
+        # Build and execute pgdn command
+        pgdn_cmd = self._build_pgdn_command(decision, target, org_id, additional_args)
+        result["pgdn_command"] = pgdn_cmd
+        
+        if decision.next_action != NextAction.SKIP:
+            try:
+                pgdn_result = self._execute_pgdn(pgdn_cmd)
+                result["pgdn_result"] = pgdn_result
+                result["executed"] = True
+                logger.info("Successfully executed: %s", pgdn_cmd)
+            except subprocess.CalledProcessError as e:
+                logger.error("pgdn command failed: %s", e)
+                result["pgdn_result"] = {"error": str(e), "returncode": e.returncode}
+        else:
+            logger.info("Skipping execution due to decision: %s", decision.next_action)
+        
+        return result
+    
+    async def aorchestrate_and_execute(
+        self,
+        target: str,
+        org_id: str,
+        node_data: Optional[Dict[str, Any]] = None,
+        org_data: Optional[Dict[str, Any]] = None,
+        policy_data: Optional[Dict[str, Any]] = None,
+        dry_run: bool = False,
+        additional_args: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Async variant of orchestrate_and_execute
+        
+        The AI decision and the pgdn subprocess are awaited without blocking
+        the event loop.
+        
+        Returns:
+            Dict containing decision and execution results
+        """
+        node_data, org_data, policy_data = self._resolve_inputs(
+            target, org_id, node_data, org_data, policy_data
+        )
+        
+        # Make orchestration decision
+        decision = await self.agent.adecide(node_data, org_data, policy_data)
+        
+        result = self._new_result(decision, target, org_id)
+        
+        if dry_run:
+            return result
+        
+        # Build and execute pgdn command
+        pgdn_cmd = self._build_pgdn_command(decision, target, org_id, additional_args)
+        result["pgdn_command"] = pgdn_cmd
+        
+        if decision.next_action != NextAction.SKIP:
+            try:
+                pgdn_result = await self._aexecute_pgdn(pgdn_cmd)
+                result["pgdn_result"] = pgdn_result
+                result["executed"] = True
+                logger.info("Successfully executed: %s", pgdn_cmd)
+            except subprocess.CalledProcessError as e:
+                logger.error("pgdn command failed: %s", e)
+                result["pgdn_result"] = {"error": str(e), "returncode": e.returncode}
+        else:
+            logger.info("Skipping execution due to decision: %s", decision.next_action)
+        
+        return result
+    
+    async def aorchestrate_many(
+        self,
+        targets: List[str],
+        org_id: str,
+        **kwargs: Any
+    ) -> List[Dict[str, Any]]:
+        """
+        Orchestrate several targets concurrently
+        
+        At most the organisation's max_concurrent_scans targets are in flight
+        at once.
+        
+        Args:
+            targets: Target hosts/IPs
+            org_id: Organisation ID
+            **kwargs: Passed through to aorchestrate_and_execute
+            
+        Returns:
+            Results in the same order as targets
+            
+        Raises:
+            ValueError: If the organisation allows fewer than one concurrent scan
+        """
+        org_data = kwargs.get("org_data")
+        if org_data is None:
+            from .cli import create_default_organisation
+            org_data = create_default_organisation(org_id)
+        
+        max_concurrent_scans = Organisation.from_untrusted(org_data).max_concurrent_scans
+        if max_concurrent_scans < 1:
+            # A zero-slot semaphore would make every target wait forever
+            raise ValueError(f"max_concurrent_scans must be at least 1, got {max_concurrent_scans}")
+        semaphore = asyncio.Semaphore(max_concurrent_scans)
+        
+        async def bounded(target: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.aorchestrate_and_execute(target, org_id, **kwargs)
+        
+        return await asyncio.gather(*(bounded(target) for target in targets))
+    
+    def _resolve_inputs(
+        self,
+        target: str,
+        org_id: str,
+        node_data: Optional[Dict[str, Any]],
+        org_data: Optional[Dict[str, Any]],
+        policy_data: Optional[Dict[str, Any]]
+    ) -> Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any]]:
+        """Fill in default node, organisation and policy data"""
+        from .cli import create_default_node, create_default_organisation, create_default_scan_policy
+        
+        # Create defaults if not provided
+        if node_data is None:
+            node_data = create_default_node(target)
+        if org_data is None:
+            org_data = create_default_organisation(org_id)
+        if policy_data is None:
+            policy_data = create_default_scan_policy()
+        
+        return node_data, org_data, policy_data
+    
+    def _new_result(self, decision: OrchestrationDecision, target: str, org_id: str) -> Dict[str, Any]:
+        """Initial result payload for an orchestration run"""
+        return {
+            "decision": decision.model_dump(),
+            "target": target,
+            "org_id": org_id,
+            "executed": False,
+            "pgdn_result": None,
+            "pgdn_command": None
+        }
+    
+    def _build_pgdn_command(
+        self,
+        decision: OrchestrationDecision,
+        target: str,
+        org_id: str,
+        additional_args: Optional[List[str]] = None
+    ) -> List[str]:
+        """Build pgdn command based on orchestration decision"""
+        
+        # Only scan actions carry a scan level into the command
+        scan_level = decision.scan_level if decision.next_action.startswith("scan_") else None
+        prefix, suffix = self._cmd_templates.get(
+            (decision.next_action, scan_level), self._cmd_templates["default"]
+        )
+        
+        cmd = [*prefix, target, *suffix, org_id]
+        
+        # Add additional arguments if provided
+        if additional_args:
+            cmd.extend(additional_args)
+        
+        return cmd
+    
+    @staticmethod
+    def _build_cmd_templates(pgdn_binary: str) -> Dict[Any, CommandTemplate]:
+        """Precompute the static parts of every pgdn command"""
+        
+        scan_prefix = (pgdn_binary, "--stage", "scan", "--target")
+        
+        templates: Dict[Any, CommandTemplate] = {
+            # Default fallback
+            "default": (scan_prefix, ("--org-id",)),
+            ("run_discovery", None): ((pgdn_binary, "--stage", "discovery", "--target"), ("--org-id",)),
+            # For manual review, we might want to log or create a ticket
+            # For now, just do a basic scan for information gathering
+            ("manual_review", None): (scan_prefix, ("--scan-level", "light", "--org-id")),
+        }
+        
+        for action in ("scan_light", "scan_medium", "scan_ferocious"):
+            templates[(action, None)] = (scan_prefix, ("--org-id",))
+            for level in ("light", "medium", "ferocious"):
+                templates[(action, level)] = (scan_prefix, ("--scan-level", level, "--org-id"))
+        
+        return templates
+    
+    async def _aexecute_pgdn(self, cmd: List[str]) -> Dict[str, Any]:
+        """Execute pgdn command as an asyncio subprocess and return results"""
+        
+        logger.debug("Executing command: %s", cmd)
+        
+        proc = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+        
+        try:
+            stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=300)  # 5 minute timeout
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
+            logger.error("Command timed out: %s", cmd)
+            raise subprocess.CalledProcessError(124, cmd, "Command timed out")
+        
+        # communicate() already waited for exit; wait() just returns the code as an int
+        returncode = await proc.wait()
+        result = {
+            "returncode": returncode,
+            "stdout": stdout.decode(errors="replace"),
+            "stderr": stderr.decode(errors="replace"),
+            "success": returncode == 0
+        }
+        
+        if returncode != 0:
+            logger.error("Command failed with return code %s: %s", returncode, cmd)
+            result["error"] = str(subprocess.CalledProcessError(returncode, cmd))
+        
+        return result
+    
+    def _execute_pgdn(self, cmd: List[str]) -> Dict[str, Any]:
+        """Execute pgdn command and return results"""
+        
+        logger.debug("Executing command: %s", cmd)
+        
+        try:
+            result = subprocess.run(
+                cmd,
+                capture_output=True,
+                text=True,
+                timeout=300,  # 5 minute timeout
+                check=True
+            )
+            
+            return {
+                "returncode": result.returncode,
+                "stdout": result.stdout,
+                "stderr": result.stderr,
+                "success": True
+            }
+            
+        except subprocess.TimeoutExpired as e:
+            logger.error("Command timed out: %s", cmd)
+            raise subprocess.CalledProcessError(124, cmd, "Command timed out")
+        
+        except subprocess.CalledProcessError as e:
+            logger.error("Command failed with return code %s: %s", e.returncode, cmd)
+            return {
+                "returncode": e.returncode,
+                "stdout": e.stdout or "",
+                "stderr": e.stderr or "",
+                "success": False,
+                "error": str(e)
+            }
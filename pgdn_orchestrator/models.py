@@ -2,19 +2,93 @@
 Data models for orchestration decisions and input structures
 """
 
-from typing import List, Optional, Dict, Any, Literal
-from pydantic import BaseModel, Field
-from datetime import datetime
+import time
+from enum import Enum, IntEnum
+from typing import List, Optional, Dict, Any, FrozenSet, Tuple, Type, TypeVar
+from pydantic import BaseModel, ConfigDict, Field, computed_field, field_validator
+from datetime import datetime, timezone
 
-ScanLevel = Literal["light", "medium", "ferocious"]
-NextAction = Literal["run_discovery", "scan_light", "scan_medium", "scan_ferocious", "manual_review", "skip"]
+class _StrEnum(str, Enum):
+    """str Enum that formats as its plain value in f-strings, prompts and commands"""
 
-class FollowUpAction(BaseModel):
+    def __str__(self) -> str:
+        return str.__str__(self)
+
+    def __format__(self, format_spec: str) -> str:
+        return str.__format__(self, format_spec)
+
+class ScanLevel(_StrEnum):
+    """Scan intensity"""
+    LIGHT = "light"
+    MEDIUM = "medium"
+    FEROCIOUS = "ferocious"
+
+class NextAction(_StrEnum):
+    """Action an orchestration decision can recommend"""
+    RUN_DISCOVERY = "run_discovery"
+    SCAN_LIGHT = "scan_light"
+    SCAN_MEDIUM = "scan_medium"
+    SCAN_FEROCIOUS = "scan_ferocious"
+    MANUAL_REVIEW = "manual_review"
+    SKIP = "skip"
+
+class NodeStatus(_StrEnum):
+    """Lifecycle state of a node"""
+    NEW = "new"
+    ACTIVE = "active"
+    FAILING = "failing"
+    OFFLINE = "offline"
+    UNKNOWN = "unknown"
+
+# Scan level names, indexed by ScanLevelEnum value - 1
+_LEVELS = ("light", "medium", "ferocious")
+
+class ScanLevelEnum(IntEnum):
+    """Numeric scan levels as used by the pgdn scanner"""
+    LIGHT = 1
+    MEDIUM = 2
+    FEROCIOUS = 3
+
+    @property
+    def label(self) -> str:
+        """Name of the level as used in decisions and policies"""
+        return _LEVELS[self - 1]
+
+ModelT = TypeVar("ModelT", bound="OrchestratorModel")
+
+class OrchestratorModel(BaseModel):
+    """Base model with separate constructors for trusted and external data"""
+    # Enum fields hold enum members; being str Enums they still compare
+    # equal to, and render as, their plain string values.
+    # Instances are immutable; derive changed copies with model_copy(update=...).
+    model_config = ConfigDict(
+        frozen=True,
+        extra="ignore",
+        revalidate_instances="never",
+        validate_default=False,
+        str_strip_whitespace=False,
+    )
+
+    @classmethod
+    def from_trusted(cls: Type[ModelT], data: Dict[str, Any]) -> ModelT:
+        """
+        Build from data this package produced itself (cache entries, model dumps)
+
+        Validation is skipped, so data must already match the schema.
+        """
+        return cls.model_construct(**data)
+
+    @classmethod
+    def from_untrusted(cls: Type[ModelT], data: Any) -> ModelT:
+        """Build from external input, running full validation"""
+        return cls.model_validate(data)
+
+class FollowUpAction(OrchestratorModel):
     """Expected follow-up action based on conditions"""
     condition: str = Field(..., description="Condition that triggers this action")
     action: str = Field(..., description="Action to take when condition is met")
 
-class OrchestrationDecision(BaseModel):
+class OrchestrationDecision(OrchestratorModel):
     """AI orchestration decision output"""
     next_action: NextAction = Field(..., description="Immediate next action to take")
     scan_level: Optional[ScanLevel] = Field(None, description="Scan level if action is a scan")
@@ -24,40 +98,170 @@ class OrchestrationDecision(BaseModel):
         description="Expected follow-up actions based on outcomes"
     )
     confidence: float = Field(default=0.8, ge=0.0, le=1.0, description="Confidence in decision")
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    ts_ns: int = Field(default_factory=time.time_ns, description="Creation time in epoch nanoseconds")
+
+    @computed_field  # type: ignore[prop-decorator]
+    @property
+    def timestamp(self) -> datetime:
+        """Creation time as an aware UTC datetime"""
+        return datetime.fromtimestamp(self.ts_ns / 1e9, tz=timezone.utc)
+
+    @classmethod
+    def from_trusted(cls, data: Dict[str, Any]) -> "OrchestrationDecision":
+        follow_up = [
+            item if isinstance(item, FollowUpAction) else FollowUpAction.from_trusted(item)
+            for item in data.get("expected_follow_up", ())
+        ]
+        scan_level = data.get("scan_level")
+        fields = {
+            **data,
+            "next_action": NextAction(data["next_action"]),
+            "scan_level": None if scan_level is None else ScanLevel(scan_level),
+            "expected_follow_up": follow_up,
+        }
+        # timestamp is derived from ts_ns; a dumped copy must not shadow it
+        fields.pop("timestamp", None)
+        return cls.model_construct(**fields)
+
+def decision_llm_schema() -> Dict[str, Any]:
+    """JSON schema of the decision fields the AI fills in (internal fields removed)"""
+    schema = OrchestrationDecision.model_json_schema()
+    schema["properties"].pop("ts_ns", None)
+    return schema
 
-class Node(BaseModel):
+class BatchDecisionItem(OrchestrationDecision):
+    """Decision for one node of a batched request"""
+    index: int = Field(..., ge=0, description="Position of the node in the batch prompt")
+
+class BatchDecisionResponse(OrchestratorModel):
+    """AI output for a batched decision request"""
+    decisions: List[BatchDecisionItem] = Field(default_factory=list)
+
+    @classmethod
+    def from_trusted(cls, data: Dict[str, Any]) -> "BatchDecisionResponse":
+        return cls.model_construct(
+            decisions=[BatchDecisionItem.from_trusted(item) for item in data.get("decisions", ())]
+        )
+
+# Per-scan keys stored in their own typed column; any other keys go to extras
+_HISTORY_COLUMN_KEYS = frozenset({"timestamp", "level", "outcome", "trust_delta"})
+
+class ScanHistory(OrchestratorModel):
+    """Previous scan results stored as parallel immutable columns rather than one dict per scan"""
+    timestamps: Tuple[Optional[datetime], ...] = Field(default=(), description="When each scan ran")
+    levels: Tuple[Optional[str], ...] = Field(default=(), description="Level of each scan")
+    outcomes: Tuple[Optional[str], ...] = Field(default=(), description="Result of each scan")
+    trust_deltas: Tuple[float, ...] = Field(default=(), description="Trust score change from each scan")
+    extras: Dict[int, Dict[str, Any]] = Field(
+        default_factory=dict,
+        description="Remaining keys of scan entries, by scan index; scans without any are omitted"
+    )
+
+    @classmethod
+    def from_entries(cls, entries: List[Any]) -> "ScanHistory":
+        """
+        Build from per-scan dicts with timestamp/level/outcome/trust_delta keys
+
+        Other keys of an entry are kept in extras under the entry's index.
+
+        Raises:
+            ValueError: If an entry is not a dict
+        """
+        for entry in entries:
+            if not isinstance(entry, dict):
+                raise ValueError(f"scan history entries must be dicts, got {type(entry).__name__}")
+
+        return cls(
+            timestamps=tuple(entry.get("timestamp") for entry in entries),
+            levels=tuple(entry.get("level") for entry in entries),
+            outcomes=tuple(entry.get("outcome") for entry in entries),
+            trust_deltas=tuple(entry.get("trust_delta") or 0.0 for entry in entries),
+            extras={
+                index: {key: value for key, value in entry.items() if key not in _HISTORY_COLUMN_KEYS}
+                for index, entry in enumerate(entries)
+                if any(key not in _HISTORY_COLUMN_KEYS for key in entry)
+            },
+        )
+
+    def append(self, entry: Dict[str, Any]) -> "ScanHistory":
+        """
+        Return a new history with one more scan result; this one is left unchanged
+
+        Raises:
+            ValueError: If the entry is not a dict
+        """
+        added = ScanHistory.from_entries([entry])
+        return self.model_copy(update={
+            "timestamps": self.timestamps + added.timestamps,
+            "levels": self.levels + added.levels,
+            "outcomes": self.outcomes + added.outcomes,
+            "trust_deltas": self.trust_deltas + added.trust_deltas,
+            "extras": {**self.extras, **{len(self) + index: extra for index, extra in added.extras.items()}},
+        })
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+class Node(OrchestratorModel):
     """Node metadata for orchestration decisions"""
     id: str = Field(..., description="Unique node identifier")
     host: str = Field(..., description="Node hostname or IP address")
     protocol: Optional[str] = Field(None, description="Identified protocol (sui, filecoin, etc.)")
     last_scan_time: Optional[datetime] = Field(None, description="Timestamp of last scan")
     last_scan_level: Optional[ScanLevel] = Field(None, description="Level of last scan performed")
-    scan_history: List[Dict[str, Any]] = Field(default_factory=list, description="Previous scan results")
+    scan_history: ScanHistory = Field(default_factory=ScanHistory, description="Previous scan results")
     open_ports: List[int] = Field(default_factory=list, description="Known open ports")
     services: Dict[str, str] = Field(default_factory=dict, description="Identified services")
     trust_score: Optional[float] = Field(None, ge=0.0, le=100.0, description="Current trust score")
     discovery_attempts: int = Field(default=0, description="Number of discovery attempts")
     scan_failures: int = Field(default=0, description="Number of consecutive scan failures")
-    status: Literal["new", "active", "failing", "offline", "unknown"] = Field(default="new")
+    status: NodeStatus = Field(default=NodeStatus.NEW)
 
-class Organisation(BaseModel):
+    @field_validator("scan_history", mode="before")
+    @classmethod
+    def _history_from_entries(cls, history: Any) -> Any:
+        """Accept the older list-of-dicts form of scan history"""
+        if isinstance(history, list):
+            return ScanHistory.from_entries(history)
+        return history
+
+    @property
+    def last_scan_epoch(self) -> Optional[float]:
+        """Last scan time as epoch seconds (naive timestamps are taken as UTC)"""
+        if self.last_scan_time is None:
+            return None
+        if self.last_scan_time.tzinfo is None:
+            return self.last_scan_time.replace(tzinfo=timezone.utc).timestamp()
+        return self.last_scan_time.timestamp()
+
+class Organisation(OrchestratorModel):
     """Organisation context and permissions"""
     id: str = Field(..., description="Organisation identifier")
     name: Optional[str] = Field(None, description="Organisation name")
     ferocious_enabled: bool = Field(default=False, description="Permission for ferocious scans")
     max_concurrent_scans: int = Field(default=10, description="Maximum concurrent scans allowed")
     scan_budget_daily: Optional[int] = Field(None, description="Daily scan budget limit")
-    whitelisted_protocols: List[str] = Field(default_factory=list, description="Protocols org is authorized to scan")
-    blacklisted_hosts: List[str] = Field(default_factory=list, description="Hosts to never scan")
+    whitelisted_protocols: FrozenSet[str] = Field(default_factory=frozenset, description="Protocols org is authorized to scan")
+    blacklisted_hosts: FrozenSet[str] = Field(default_factory=frozenset, description="Hosts to never scan (lower-cased)")
     scan_preferences: Dict[str, Any] = Field(default_factory=dict, description="Custom scan preferences")
 
-class ScanPolicy(BaseModel):
+    @field_validator("blacklisted_hosts", mode="after")
+    @classmethod
+    def _normalize_hosts(cls, hosts: FrozenSet[str]) -> FrozenSet[str]:
+        """Hostnames are case-insensitive, so store them lower-cased"""
+        return frozenset(host.lower() for host in hosts)
+
+class ScanPolicy(OrchestratorModel):
     """Global scan policy configuration"""
-    max_escalation: ScanLevel = Field(default="medium", description="Maximum allowed scan level")
+    max_escalation: ScanLevel = Field(default=ScanLevel.MEDIUM, description="Maximum allowed scan level")
     require_discovery: bool = Field(default=True, description="Require protocol discovery before scanning")
     max_discovery_attempts: int = Field(default=3, description="Maximum discovery attempts before manual review")
     scan_cooldown_hours: int = Field(default=24, description="Hours between scans of same node")
     auto_escalation_enabled: bool = Field(default=True, description="Allow automatic scan escalation")
     trust_score_threshold_medium: float = Field(default=70.0, description="Trust score threshold for medium scans")
     trust_score_threshold_ferocious: float = Field(default=50.0, description="Trust score threshold for ferocious scans")
+
+    @property
+    def scan_cooldown_seconds(self) -> float:
+        """Scan cooldown expressed in seconds"""
+        return self.scan_cooldown_hours * 3600.0
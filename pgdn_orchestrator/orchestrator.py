@@ -1,16 +1,64 @@
+import asyncio
+import functools
+
 from pgdn.scanning.scan_orchestrator import ScanOrchestrator
 from pgdn.core.config import Config
 
+from .models import ScanLevelEnum
+
+# Every accepted scan_level spelling -> the scanner's numeric level. IntEnum
+# members hash like their ints, so ScanLevelEnum values hit the int keys.
+_LEVEL_MAP = {
+    **{int(level): int(level) for level in ScanLevelEnum},
+    **{level.label: int(level) for level in ScanLevelEnum},
+}
+
+def _normalize_level(scan_level):
+    """Map an int, level name or ScanLevelEnum to the scanner's numeric level"""
+    try:
+        return _LEVEL_MAP[scan_level]
+    except (KeyError, TypeError):
+        raise ValueError(f"Invalid scan level: {scan_level!r}") from None
+
+@functools.lru_cache(maxsize=1)
+def _get_orch():
+    """Build the pgdn Config and ScanOrchestrator once and reuse them for every scan"""
+    return ScanOrchestrator(Config())
+
 def run_scan(target, org_id, scan_level=1):
     """
     Run a scan using the external pgdn library's ScanOrchestrator.
     Args:
         target (str): The target host/IP to scan.
         org_id (str): The organization ID.
-        scan_level (int): Scan level (1, 2, or 3).
+        scan_level (int | str | ScanLevelEnum): Scan level (1, 2, 3 or
+            "light", "medium", "ferocious").
     Returns:
         dict: Scan results from the orchestrator.
     """
-    config = Config()
-    orchestrator = ScanOrchestrator(config)
-    return orchestrator.scan(target, org_id=org_id, scan_level=scan_level) 
\ No newline at end of file
+    return _get_orch().scan(target, org_id=org_id, scan_level=_normalize_level(scan_level))
+
+async def run_scans(jobs, concurrency=10):
+    """
+    Run several scans concurrently, each in a worker thread.
+    Args:
+        jobs (list): (target, org_id, scan_level) tuples.
+        concurrency (int): Maximum scans in flight at once; pass the
+            organisation's max_concurrent_scans to respect its limit.
+    Returns:
+        list: Scan results in the same order as jobs.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    orchestrator = _get_orch()
+    loop = asyncio.get_running_loop()
+
+    async def one(target, org_id, scan_level):
+        async with semaphore:
+            return await loop.run_in_executor(
+                None,
+                functools.partial(
+                    orchestrator.scan, target, org_id=org_id, scan_level=_normalize_level(scan_level)
+                )
+            )
+
+    return await asyncio.gather(*(one(*job) for job in jobs))
@@ -2,24 +2,51 @@
 Prompt generation for AI orchestration decisions
 """
 
-from .models import Node, Organisation, ScanPolicy
+import sys
+import functools
+from itertools import chain
+from typing import IO, Any, Callable, List, Tuple, Union
 
-class PromptGenerator:
-    """Generates prompts for AI orchestration decisions"""
-    
-    def generate_orchestration_prompt(
-        self, 
-        node: Node, 
-        organisation: Organisation, 
-        scan_policy: ScanPolicy
-    ) -> str:
-        """Generate the main orchestration prompt"""
-        
-        return f"""You are a DePIN orchestration agent responsible for deciding the next scanning action on a node.
+import orjson
+
+from pydantic import TypeAdapter
+
+from .models import (
+    BatchDecisionItem,
+    BatchDecisionResponse,
+    FollowUpAction,
+    NextAction,
+    Node,
+    OrchestrationDecision,
+    Organisation,
+    ScanLevel,
+    ScanPolicy,
+    decision_llm_schema,
+)
+
+# Serialized once per process from the model, so the prompt cannot drift from it
+_SCHEMA_JSON = orjson.dumps(decision_llm_schema()).decode()
+_EXAMPLE_JSON = orjson.dumps(
+    OrchestrationDecision(
+        next_action=NextAction.RUN_DISCOVERY,
+        scan_level=ScanLevel.LIGHT,
+        reasoning="Detailed explanation of decision logic",
+        expected_follow_up=[
+            FollowUpAction(condition="discovery succeeds and identifies validator protocol", action="scan_medium"),
+            FollowUpAction(condition="discovery fails after 3 attempts", action="manual_review"),
+        ],
+        confidence=0.85,
+    ).model_dump(mode="json", exclude={"ts_ns", "timestamp"}),
+    option=orjson.OPT_INDENT_2,
+).decode()
+
+# Identical for every request, so it always leads the prompt and can be
+# reused as a cached prefix on the provider side.
+_PROMPT_PREFIX = sys.intern(f"""You are a DePIN orchestration agent responsible for deciding the next scanning action on a node.
 
 Each node can be scanned at one of three levels:
 - light: basic recon and port scanning
-- medium: service analysis, vulnerability detection, and trust scoring  
+- medium: service analysis, vulnerability detection, and trust scoring
 - ferocious: deep, aggressive scan with comprehensive security assessment (requires permission)
 
 Instructions:
@@ -39,57 +66,17 @@ Available actions:
 - manual_review: Flag for human investigation
 - skip: Skip scanning (e.g., due to cooldown or policy)
 
-Return your result in JSON using the following schema:
+Return your result as JSON matching this schema:
 
 ```json
-{{
-  "next_action": "run_discovery",
-  "scan_level": "light",
-  "reasoning": "Detailed explanation of decision logic",
-  "expected_follow_up": [
-    {{
-      "condition": "discovery succeeds and identifies validator protocol",
-      "action": "scan_medium"
-    }},
-    {{
-      "condition": "discovery fails after 3 attempts",
-      "action": "manual_review"
-    }}
-  ],
-  "confidence": 0.85
-}}
+{_SCHEMA_JSON}
 ```
 
-Node metadata:
-- ID: {node.id}
-- Host: {node.host}
-- Protocol: {node.protocol or "Unknown"}
-- Status: {node.status}
-- Last scan: {node.last_scan_time or "Never"}
-- Last scan level: {node.last_scan_level or "None"}
-- Discovery attempts: {node.discovery_attempts}
-- Scan failures: {node.scan_failures}
-- Open ports: {node.open_ports}
-- Services: {node.services}
-- Trust score: {node.trust_score or "Not calculated"}
-- Scan history count: {len(node.scan_history)}
-
-Organisation context:
-- ID: {organisation.id}
-- Name: {organisation.name or "Unknown"}
-- Ferocious scans enabled: {organisation.ferocious_enabled}
-- Max concurrent scans: {organisation.max_concurrent_scans}
-- Daily scan budget: {organisation.scan_budget_daily or "Unlimited"}
-- Whitelisted protocols: {organisation.whitelisted_protocols or "All"}
-- Blacklisted hosts: {len(organisation.blacklisted_hosts)} hosts
+For example:
 
-Global scan policy:
-- Max escalation level: {scan_policy.max_escalation}
-- Require discovery: {scan_policy.require_discovery}
-- Max discovery attempts: {scan_policy.max_discovery_attempts}
-- Scan cooldown hours: {scan_policy.scan_cooldown_hours}
-- Auto escalation enabled: {scan_policy.auto_escalation_enabled}
-- Trust thresholds: medium={scan_policy.trust_score_threshold_medium}, ferocious={scan_policy.trust_score_threshold_ferocious}
+```json
+{_EXAMPLE_JSON}
+```
 
 Decision Guidelines:
 1. New nodes with unknown protocol should start with discovery
@@ -97,5 +84,281 @@ Decision Guidelines:
 3. Failed discovery attempts should trigger manual review after max attempts
 4. Respect cooldown periods between scans
 5. Consider escalation based on previous scan results and trust scores
-6. Always check organisational permissions before recommending ferocious scans
-"""
+6. Always check organisational permissions before recommending ferocious scans""")
+
+# Organisation and policy context, shared by every node of a pair
+_CONTEXT_TEMPLATE = """Organisation context:
+- ID: {org_id}
+- Name: {org_name}
+- Ferocious scans enabled: {ferocious_enabled}
+- Max concurrent scans: {max_concurrent_scans}
+- Daily scan budget: {scan_budget_daily}
+- Whitelisted protocols: {whitelisted_protocols}
+- Blacklisted hosts: {blacklisted_host_count} hosts
+
+Global scan policy:
+- Max escalation level: {max_escalation}
+- Require discovery: {require_discovery}
+- Max discovery attempts: {max_discovery_attempts}
+- Scan cooldown hours: {scan_cooldown_hours}
+- Auto escalation enabled: {auto_escalation_enabled}
+- Trust thresholds: medium={trust_score_threshold_medium}, ferocious={trust_score_threshold_ferocious}"""
+
+# Constant fragments of the per-node section; node values are interleaved
+# between consecutive fragments and joined in a single pass
+_NODE_PARTS = (
+    "Node metadata:\n- ID: ",
+    "\n- Host: ",
+    "\n- Protocol: ",
+    "\n- Status: ",
+    "\n- Last scan: ",
+    "\n- Last scan level: ",
+    "\n- Discovery attempts: ",
+    "\n- Scan failures: ",
+    "\n- Open ports: ",
+    "\n- Services: ",
+    "\n- Trust score: ",
+    "\n- Scan history count: ",
+    "\n",
+)
+
+def _node_key(node: Node) -> Tuple[Any, ...]:
+    """Projection of the node fields that appear in the prompt"""
+    return (
+        node.id, node.host, node.protocol, node.status, node.last_scan_time,
+        node.last_scan_level, node.discovery_attempts, node.scan_failures,
+        tuple(node.open_ports), tuple(sorted(node.services.items())),
+        node.trust_score, len(node.scan_history),
+    )
+
+def _org_key(organisation: Organisation) -> Tuple[Any, ...]:
+    """Projection of the organisation fields that appear in the prompt"""
+    return (
+        organisation.id, organisation.name, organisation.ferocious_enabled,
+        organisation.max_concurrent_scans, organisation.scan_budget_daily,
+        tuple(sorted(organisation.whitelisted_protocols)), len(organisation.blacklisted_hosts),
+    )
+
+def _policy_key(scan_policy: ScanPolicy) -> Tuple[Any, ...]:
+    """Projection of the policy fields that appear in the prompt"""
+    return (
+        scan_policy.max_escalation, scan_policy.require_discovery,
+        scan_policy.max_discovery_attempts, scan_policy.scan_cooldown_hours,
+        scan_policy.auto_escalation_enabled, scan_policy.trust_score_threshold_medium,
+        scan_policy.trust_score_threshold_ferocious,
+    )
+
+def prompt_key(
+    node: Node,
+    organisation: Organisation,
+    scan_policy: ScanPolicy
+) -> Tuple[Tuple[Any, ...], Tuple[Any, ...], Tuple[Any, ...]]:
+    """
+    Everything the orchestration prompt depends on, as plain ordered tuples
+
+    Set-valued fields are sorted, so the key is identical across processes
+    regardless of hash randomization.
+    """
+    return _node_key(node), _org_key(organisation), _policy_key(scan_policy)
+
+def _node_values(node_key: Tuple[Any, ...]) -> Tuple[str, ...]:
+    """Formatted node values, one per slot between the _NODE_PARTS fragments"""
+    (
+        node_id, host, protocol, status, last_scan_time, last_scan_level,
+        discovery_attempts, scan_failures, open_ports, services,
+        trust_score, scan_history_count,
+    ) = node_key
+
+    return (
+        node_id,
+        host,
+        protocol or "Unknown",
+        str(status),
+        str(last_scan_time or "Never"),
+        last_scan_level or "None",
+        str(discovery_attempts),
+        str(scan_failures),
+        orjson.dumps(open_ports).decode(),
+        orjson.dumps(dict(services)).decode(),
+        str(trust_score or "Not calculated"),
+        str(scan_history_count),
+    )
+
+def _render_node(node_key: Tuple[Any, ...]) -> str:
+    """Render the per-node section from its key"""
+    return "".join(chain.from_iterable(zip(_NODE_PARTS, _node_values(node_key)))) + _NODE_PARTS[-1]
+
+def _write_node(node_key: Tuple[Any, ...], write: Callable[[str], Any]) -> None:
+    """Write the per-node section fragment by fragment"""
+    for part, value in zip(_NODE_PARTS, _node_values(node_key)):
+        write(part)
+        write(value)
+    write(_NODE_PARTS[-1])
+
+@functools.lru_cache(maxsize=256)
+def _render_context(org_key: Tuple[Any, ...], policy_key: Tuple[Any, ...]) -> str:
+    """Render the organisation/policy context"""
+    (
+        org_id, org_name, ferocious_enabled, max_concurrent_scans,
+        scan_budget_daily, whitelisted_protocols, blacklisted_host_count,
+    ) = org_key
+    (
+        max_escalation, require_discovery, max_discovery_attempts, scan_cooldown_hours,
+        auto_escalation_enabled, trust_score_threshold_medium, trust_score_threshold_ferocious,
+    ) = policy_key
+
+    return _CONTEXT_TEMPLATE.format(
+        org_id=org_id,
+        org_name=org_name or "Unknown",
+        ferocious_enabled=ferocious_enabled,
+        max_concurrent_scans=max_concurrent_scans,
+        scan_budget_daily=scan_budget_daily or "Unlimited",
+        whitelisted_protocols=(
+            orjson.dumps(whitelisted_protocols).decode() if whitelisted_protocols else "All"
+        ),
+        blacklisted_host_count=blacklisted_host_count,
+        max_escalation=max_escalation,
+        require_discovery=require_discovery,
+        max_discovery_attempts=max_discovery_attempts,
+        scan_cooldown_hours=scan_cooldown_hours,
+        auto_escalation_enabled=auto_escalation_enabled,
+        trust_score_threshold_medium=trust_score_threshold_medium,
+        trust_score_threshold_ferocious=trust_score_threshold_ferocious,
+    )
+
+def _format_context(
+    node_key: Tuple[Any, ...],
+    org_key: Tuple[Any, ...],
+    policy_key: Tuple[Any, ...]
+) -> str:
+    """Variable part of the prompt that follows the static prefix"""
+    return f"\n\n{_render_context(org_key, policy_key)}\n\n{_render_node(node_key)}"
+
+@functools.lru_cache(maxsize=4096)
+def _render(node_key: Tuple[Any, ...], org_key: Tuple[Any, ...], policy_key: Tuple[Any, ...]) -> str:
+    """Full orchestration prompt; a pure function of the projected inputs"""
+    return _PROMPT_PREFIX + _format_context(node_key, org_key, policy_key)
+
+@functools.lru_cache(maxsize=4096)
+def _render_bytes(node_key: Tuple[Any, ...], org_key: Tuple[Any, ...], policy_key: Tuple[Any, ...]) -> bytes:
+    """UTF-8 encoded prompt, memoized alongside the rendered string"""
+    return _render(node_key, org_key, policy_key).encode("utf-8")
+
+def clear_prompt_caches() -> None:
+    """Drop memoized prompts in both forms, along with the shared context sections"""
+    _render_context.cache_clear()
+    _render.cache_clear()
+    _render_bytes.cache_clear()
+
+# Compiled once at import; validates a whole bare-array batch reply in one call
+_DECISION_LIST_ADAPTER = TypeAdapter(List[BatchDecisionItem])
+
+class PromptGenerator:
+    """Generates prompts for AI orchestration decisions"""
+
+    def generate_orchestration_prompt(
+        self,
+        node: Node,
+        organisation: Organisation,
+        scan_policy: ScanPolicy
+    ) -> str:
+        """Generate the main orchestration prompt"""
+
+        return _render(_node_key(node), _org_key(organisation), _policy_key(scan_policy))
+
+    def generate_orchestration_prompt_bytes(
+        self,
+        node: Node,
+        organisation: Organisation,
+        scan_policy: ScanPolicy
+    ) -> bytes:
+        """Generate the orchestration prompt already encoded as UTF-8"""
+
+        return _render_bytes(_node_key(node), _org_key(organisation), _policy_key(scan_policy))
+
+    def generate_orchestration_prompt_into(
+        self,
+        buf: IO[str],
+        node: Node,
+        organisation: Organisation,
+        scan_policy: ScanPolicy
+    ) -> None:
+        """
+        Write the orchestration prompt into a caller-supplied text buffer
+
+        Lets callers compose a larger message in one buffer (e.g. a StringIO
+        shared with other writers) and take buf.getvalue() once at the end,
+        instead of concatenating whole prompt strings.
+        """
+
+        write = buf.write
+        write(_PROMPT_PREFIX)
+        write("\n\n")
+        write(_render_context(_org_key(organisation), _policy_key(scan_policy)))
+        write("\n\n")
+        _write_node(_node_key(node), write)
+
+    def generate_batch_orchestration_prompt(
+        self,
+        nodes: List[Node],
+        organisation: Organisation,
+        scan_policy: ScanPolicy
+    ) -> str:
+        """
+        Generate a prompt asking for one decision per node in a single response
+
+        Instructions and organisation context appear once; nodes follow as
+        "[0] Node metadata: ...", "[1] Node metadata: ..." and the model is
+        asked to tag each decision with the same index.
+        """
+
+        context = self.org_context(organisation, scan_policy)
+        deltas = "\n".join(f"[{index}] {self.node_delta(node)}" for index, node in enumerate(nodes))
+        return _PROMPT_PREFIX + f"""
+
+{context}
+
+You are deciding for {len(nodes)} nodes at once. Return a JSON object of the form
+{{"decisions": [{{"index": 0, "next_action": ..., "scan_level": ..., "reasoning": ..., "expected_follow_up": [...], "confidence": ...}}, {{"index": 1, ...}}, ...]}}
+with exactly one entry per node below, each following the schema above and "index" set to the node's [index].
+
+{deltas}"""
+
+    def split_prefix(self, prompt: str) -> Tuple[str, str]:
+        """
+        Split a generated prompt into its static prefix and variable tail
+
+        Returns:
+            (prefix, tail); prefix is empty if the prompt does not start with it
+        """
+
+        if prompt.startswith(_PROMPT_PREFIX):
+            return _PROMPT_PREFIX, prompt[len(_PROMPT_PREFIX):]
+        return "", prompt
+
+    def parse_batch_response(self, text: Union[str, bytes]) -> List[BatchDecisionItem]:
+        """
+        Decode and validate a batch response
+
+        Accepts either the {"decisions": [...]} object requested by the prompt
+        or a bare JSON array of decisions.
+
+        Returns:
+            Decisions ordered by index; indices the model left out are absent
+        """
+
+        if text.lstrip()[:1] in ("[", b"["):
+            items = _DECISION_LIST_ADAPTER.validate_json(text)
+        else:
+            items = BatchDecisionResponse.model_validate_json(text).decisions
+        return sorted(items, key=lambda item: item.index)
+
+    def org_context(self, organisation: Organisation, scan_policy: ScanPolicy) -> str:
+        """Organisation and policy context, shared across nodes"""
+
+        return _render_context(_org_key(organisation), _policy_key(scan_policy))
+
+    def node_delta(self, node: Node) -> str:
+        """Per-node portion of the prompt"""
+
+        return _render_node(_node_key(node))
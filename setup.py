@@ -1,10 +1,14 @@
+from pathlib import Path
+
 from setuptools import setup, find_packages
 
+LONG_DESC = (Path(__file__).parent / "README.md").read_text(encoding="utf-8")
+
 setup(
     name="pgdn-orchestrator",
     version="0.1.0",
     description="Intelligent scan orchestration for DePIN validator networks",
-    long_description=open("README.md").read(),
+    long_description=LONG_DESC,
     long_description_content_type="text/markdown",
     author="DePIN Security Team",
     packages=find_packages(),
@@ -15,6 +19,7 @@ setup(
         "pydantic>=2.0.0",
         "python-dotenv>=1.0.0",
         "typing-extensions>=4.0.0",
+        "orjson>=3.8.0",
         "pgdn",
     ],
     extras_require={
@@ -24,7 +29,10 @@ setup(
             "black>=23.0.0",
             "flake8>=6.0.0",
             "mypy>=1.0.0",
-        ]
+        ],
+        "redis": [
+            "redis>=4.2.0",
+        ],
     },
     entry_points={
         "console_scripts": [
@@ -0,0 +1,281 @@
+"""
+Tests for the orchestration agent and its caches
+"""
+
+import asyncio
+import os
+import subprocess
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import anthropic
+import pytest
+
+from pgdn_orchestrator import (
+    AIProviderError,
+    DecisionCache,
+    Node,
+    OrchestrationAgent,
+    OrchestrationDecision,
+    Organisation,
+    ScanPolicy,
+)
+from pgdn_orchestrator.models import BatchDecisionItem, BatchDecisionResponse
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+_STATE_KEY_SCRIPT = """
+from pgdn_orchestrator import DecisionCache, Node, Organisation, ScanPolicy
+node = Node(id="n1", host="10.0.0.1", services={"a": "1", "b": "2"}, open_ports=[22, 80])
+org = Organisation(
+    id="org",
+    whitelisted_protocols=["sui", "filecoin", "walrus"],
+    blacklisted_hosts=["a.example", "b.example", "c.example"],
+)
+print(DecisionCache.state_key(node, org, ScanPolicy()).hex())
+"""
+
+
+def _state_key_with_hash_seed(seed: str) -> str:
+    env = {**os.environ, "PYTHONHASHSEED": seed, "PYTHONPATH": str(REPO_ROOT)}
+    return subprocess.run(
+        [sys.executable, "-c", _STATE_KEY_SCRIPT],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout.strip()
+
+
+def test_decision_cache_key_stable_across_hash_seeds():
+    keys = {_state_key_with_hash_seed(seed) for seed in ("1", "2", "3")}
+    assert len(keys) == 1
+
+
+def test_decision_cache_key_tracks_prompt_inputs():
+    node = Node(id="n1", host="10.0.0.1")
+    org = Organisation(id="org")
+    policy = ScanPolicy()
+
+    key = DecisionCache.state_key(node, org, policy)
+    assert key == DecisionCache.state_key(Node(id="n1", host="10.0.0.1"), org, policy)
+    assert key != DecisionCache.state_key(node.model_copy(update={"trust_score": 5.0}), org, policy)
+    assert key != DecisionCache.state_key(node, org.model_copy(update={"ferocious_enabled": True}), policy)
+
+
+def test_decision_cache_purge_survives_closed_database(tmp_path):
+    cache = DecisionCache(str(tmp_path / "decisions.sqlite3"))
+    cache.close()
+    cache.purge_expired()
+
+
+def _batch_agent(monkeypatch, answer_batch):
+    """Agent whose Anthropic lane answers batch prompts with answer_batch(prompt)"""
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+    agent = OrchestrationAgent(openai_api_key="")
+    calls = []
+
+    def fake_call(prompt, client=None, batch_size=None):
+        calls.append(batch_size)
+        if batch_size:
+            return BatchDecisionResponse(decisions=answer_batch(prompt))
+        return OrchestrationDecision(next_action="run_discovery", reasoning="single")
+
+    monkeypatch.setattr(agent, "_call_anthropic", fake_call)
+    return agent, calls
+
+
+def _batch_item(index, reasoning):
+    return BatchDecisionItem(index=index, next_action="run_discovery", reasoning=reasoning)
+
+
+def test_decide_many_maps_batch_indices_to_nodes(monkeypatch):
+    # Items arrive out of order; index, not position in the list, picks the node
+    agent, calls = _batch_agent(
+        monkeypatch, lambda prompt: [_batch_item(2, "third"), _batch_item(0, "first"), _batch_item(1, "second")]
+    )
+    nodes = [{"id": f"n{i}", "host": f"10.0.0.{i}"} for i in range(3)]
+
+    decisions = agent.decide_many(nodes, {"id": "org"}, {}, batch_size=3)
+
+    assert [decision.reasoning for decision in decisions] == ["first", "second", "third"]
+    assert calls == [3]
+
+
+def test_decide_many_retries_missing_index_singly(monkeypatch):
+    agent, calls = _batch_agent(monkeypatch, lambda prompt: [_batch_item(1, "batched")])
+    nodes = [{"id": f"n{i}", "host": f"10.0.0.{i}"} for i in range(2)]
+
+    decisions = agent.decide_many(nodes, {"id": "org"}, {}, batch_size=2)
+
+    assert [decision.reasoning for decision in decisions] == ["single", "batched"]
+    assert calls == [2, None]
+
+
+def test_decide_many_rejects_non_positive_batch_size(monkeypatch):
+    agent, calls = _batch_agent(monkeypatch, lambda prompt: [])
+
+    with pytest.raises(ValueError):
+        agent.decide_many([{"id": "n1", "host": "10.0.0.1"}], {"id": "org"}, {}, batch_size=0)
+    assert calls == []
+
+
+def test_async_clients_are_created_per_event_loop(monkeypatch):
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+    agent = OrchestrationAgent(openai_api_key="")
+    lane = agent._lanes[0]
+
+    async def clients():
+        return agent._async_client(lane), agent._async_client(lane)
+
+    first, again = asyncio.run(clients())
+    second, _ = asyncio.run(clients())
+
+    assert first is again
+    assert first is not second
+
+
+def test_batch_request_stays_within_output_token_limit(monkeypatch):
+    agent, _ = _batch_agent(monkeypatch, lambda prompt: [])
+
+    request = agent._anthropic_request("prompt", batch_size=10)
+
+    assert request["max_tokens"] == 8192
+
+
+def test_decide_many_splits_batches_to_fit_output_limit(monkeypatch):
+    agent, calls = _batch_agent(
+        monkeypatch, lambda prompt: [_batch_item(i, "batched") for i in range(prompt.count("Node metadata:"))]
+    )
+    nodes = [{"id": f"n{i}", "host": f"10.0.0.{i}"} for i in range(10)]
+
+    decisions = agent.decide_many(nodes, {"id": "org"}, {}, batch_size=10)
+
+    assert len(decisions) == 10
+    assert calls == [8, 2]
+
+
+def test_aclose_closes_and_evicts_loop_clients(monkeypatch):
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+    agent = OrchestrationAgent(openai_api_key="")
+    lane = agent._lanes[0]
+
+    async def use_and_close():
+        aclient = agent._async_client(lane)
+        await agent.aclose()
+        return aclient
+
+    aclient = asyncio.run(use_and_close())
+
+    assert aclient.is_closed()
+    assert len(lane["aclients"]) == 0
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [b"not json", b'{"next_action": "rescan", "reasoning": "old schema"}', b'{"reasoning": "no action"}', b"[]"],
+)
+def test_decision_cache_treats_unreadable_rows_as_miss(tmp_path, payload):
+    cache = DecisionCache(str(tmp_path / "decisions.sqlite3"))
+    cache.db.execute(
+        "INSERT INTO decisions (key, decision, expires_at) VALUES (?, ?, ?)", (b"key", payload, 1e12)
+    )
+
+    assert cache.get(b"key") is None
+    cache.close()
+
+
+
+class _RateLimited(anthropic.RateLimitError):
+    """Rate-limit error that does not need an HTTP response to build"""
+
+    def __init__(self):
+        Exception.__init__(self, "rate limited")
+
+
+def _lane_agent(monkeypatch, primary_error, enable_fallback=True):
+    """Agent with two Anthropic lanes whose primary lane raises primary_error() while it is set"""
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+    agent = OrchestrationAgent(
+        anthropic_api_keys=["key-1", "key-2"], openai_api_key="", enable_fallback=enable_fallback
+    )
+    primary = agent._lanes[0]["client"]
+    calls = []
+
+    def fake_call(prompt, client=None, batch_size=None):
+        lane = "primary" if client is primary else "secondary"
+        calls.append(lane)
+        if lane == "primary" and primary_error[0] is not None:
+            raise primary_error[0]()
+        return OrchestrationDecision(next_action="run_discovery", reasoning=lane)
+
+    monkeypatch.setattr(agent, "_call_anthropic", fake_call)
+    return agent, calls
+
+
+def _decide(agent):
+    return agent.decide({"id": "n1", "host": "10.0.0.1"}, {"id": "org"}, {})
+
+
+def test_rate_limited_lane_is_skipped_while_cooling_down(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("pgdn_orchestrator.agent.time.monotonic", lambda: now[0])
+    agent, calls = _lane_agent(monkeypatch, [_RateLimited])
+
+    assert _decide(agent).reasoning == "secondary"
+    assert _decide(agent).reasoning == "secondary"
+    assert calls == ["primary", "secondary", "secondary"]
+
+    now[0] += 1.0
+    _decide(agent)
+    assert calls[-2:] == ["primary", "secondary"]
+
+
+def test_rate_limit_backoff_doubles_up_to_cap_and_resets_on_success(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("pgdn_orchestrator.agent.time.monotonic", lambda: now[0])
+    primary_error = [_RateLimited]
+    agent, _ = _lane_agent(monkeypatch, primary_error)
+    state = agent._provider_state["anthropic"]
+
+    backoffs = []
+    for _ in range(8):
+        _decide(agent)
+        backoffs.append(state["backoff"])
+        now[0] = state["cooldown_until"]
+    assert backoffs == [1.0, 2.0, 4.0, 8.0, 16.0, 32.0, 60.0, 60.0]
+
+    primary_error[0] = None
+    assert _decide(agent).reasoning == "primary"
+    assert state["backoff"] == 0.0
+
+
+def test_failure_without_fallback_raises(monkeypatch):
+    agent, calls = _lane_agent(monkeypatch, [lambda: RuntimeError("boom")], enable_fallback=False)
+
+    with pytest.raises(AIProviderError):
+        _decide(agent)
+    assert calls == ["primary"]
+
+
+
+def test_node_in_cooldown_is_skipped_without_calling_the_ai(monkeypatch):
+    agent, calls = _batch_agent(monkeypatch, lambda prompt: [])
+    node = {"id": "n1", "host": "10.0.0.1", "last_scan_time": datetime.now(timezone.utc) - timedelta(hours=1)}
+
+    decision = agent.decide(node, {"id": "org"}, {"scan_cooldown_hours": 24})
+
+    assert decision.next_action == "skip"
+    assert decision.scan_level is None
+    assert calls == []
+
+
+def test_new_node_with_exhausted_discovery_goes_to_manual_review(monkeypatch):
+    agent, calls = _batch_agent(monkeypatch, lambda prompt: [])
+    node = {"id": "n1", "host": "10.0.0.1", "status": "new", "discovery_attempts": 3}
+
+    decision = agent.decide(node, {"id": "org"}, {"max_discovery_attempts": 3})
+
+    assert decision.next_action == "manual_review"
+    assert calls == []
@@ -0,0 +1,58 @@
+"""
+Tests for the AI response cache
+"""
+
+from pgdn_orchestrator import LLMCache, OrchestrationAgent, OrchestrationDecision
+from pgdn_orchestrator.cache import InMemoryLRU
+
+
+def test_in_memory_entries_expire_after_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("pgdn_orchestrator.cache.time.monotonic", lambda: now[0])
+    backend = InMemoryLRU()
+
+    backend.set("key", {"v": 1}, ttl=10.0)
+    assert backend.get("key") == {"v": 1}
+
+    now[0] += 10.0
+    assert backend.get("key") is None
+
+
+def test_in_memory_evicts_least_recently_used():
+    backend = InMemoryLRU(maxsize=2)
+    backend.set("a", {"v": 1})
+    backend.set("b", {"v": 2})
+    backend.get("a")
+
+    backend.set("c", {"v": 3})
+
+    assert backend.get("a") == {"v": 1}
+    assert backend.get("b") is None
+    assert backend.get("c") == {"v": 3}
+
+
+def test_nonzero_temperature_is_only_cached_when_opted_in():
+    assert LLMCache().cache_key("model", "prompt", 0.2) is None
+    assert LLMCache().cache_key("model", "prompt", 0.0) is not None
+    assert LLMCache(cache_nonzero_temperature=True).cache_key("model", "prompt", 0.2) is not None
+
+
+def test_agent_counts_cache_hits_and_misses(monkeypatch):
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+    monkeypatch.delenv("ORCHESTRATION_TEMPERATURE", raising=False)
+    agent = OrchestrationAgent(openai_api_key="", temperature=0.0, cache=LLMCache())
+    calls = []
+
+    def fake_call(prompt, client=None, batch_size=None):
+        calls.append(prompt)
+        return OrchestrationDecision(next_action="run_discovery", reasoning="fresh")
+
+    monkeypatch.setattr(agent, "_call_anthropic", fake_call)
+    node = {"id": "n1", "host": "10.0.0.1"}
+
+    first = agent.decide(node, {"id": "org"}, {})
+    second = agent.decide(node, {"id": "org"}, {})
+
+    assert len(calls) == 1
+    assert (agent.cache_misses, agent.cache_hits) == (1, 1)
+    assert second.reasoning == first.reasoning == "fresh"
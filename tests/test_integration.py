@@ -0,0 +1,20 @@
+"""
+Tests for the pgdn integration layer
+"""
+
+import asyncio
+
+import pytest
+
+from pgdn_orchestrator import OrchestrationAgent
+from pgdn_orchestrator.integration import PgdnIntegration
+
+
+def test_orchestrate_many_rejects_zero_concurrency(monkeypatch):
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+    integration = PgdnIntegration(agent=OrchestrationAgent(openai_api_key=""))
+
+    with pytest.raises(ValueError):
+        asyncio.run(
+            integration.aorchestrate_many(["10.0.0.1"], "org", org_data={"id": "org", "max_concurrent_scans": 0})
+        )
@@ -0,0 +1,76 @@
+"""
+Tests for the orchestration data models
+"""
+
+import pytest
+from pydantic import ValidationError
+
+from pgdn_orchestrator import NextAction, Node, NodeStatus, OrchestrationDecision, ScanLevel, ScanPolicy
+
+
+def test_scan_history_keeps_unknown_entry_keys():
+    node = Node(id="n1", host="10.0.0.1", scan_history=[{"scan_level": "light", "result": "ok"}])
+    assert node.scan_history.extras == {0: {"scan_level": "light", "result": "ok"}}
+
+
+def test_scan_history_accepts_legacy_levels():
+    node = Node(id="n1", host="10.0.0.1", scan_history=[{"level": "discovery"}])
+    assert node.scan_history.levels == ("discovery",)
+
+
+def test_scan_history_rejects_non_dict_entries():
+    with pytest.raises(ValidationError):
+        Node(id="n1", host="10.0.0.1", scan_history=["light"])
+
+
+def test_scan_history_append_leaves_copies_unchanged():
+    node = Node(id="n1", host="10.0.0.1", scan_history=[{"level": "light"}])
+    copy = node.model_copy()
+
+    updated = copy.scan_history.append({"level": "medium", "trust_delta": -1.0})
+
+    assert updated.levels == ("light", "medium")
+    assert updated.trust_deltas == (0.0, -1.0)
+    assert len(node.scan_history) == len(copy.scan_history) == 1
+
+
+def test_enum_fields_hold_members_that_render_as_values():
+    decision = OrchestrationDecision(next_action="scan_light", scan_level="light", reasoning="r")
+
+    assert decision.next_action is NextAction.SCAN_LIGHT
+    assert decision.scan_level is ScanLevel.LIGHT
+    assert Node(id="n1", host="10.0.0.1").status is NodeStatus.NEW
+    assert f"{decision.next_action}/{decision.scan_level}" == "scan_light/light"
+    assert decision.model_dump(mode="json")["next_action"] == "scan_light"
+
+
+def test_trusted_decision_restores_enum_members():
+    decision = OrchestrationDecision.from_trusted(
+        {"next_action": "scan_medium", "scan_level": "medium", "reasoning": "r"}
+    )
+
+    assert decision.next_action is NextAction.SCAN_MEDIUM
+    assert decision.scan_level is ScanLevel.MEDIUM
+
+
+def test_scan_cooldown_follows_copied_policy():
+    policy = ScanPolicy()
+    assert policy.scan_cooldown_seconds == 86400.0
+
+    assert policy.model_copy(update={"scan_cooldown_hours": 1}).scan_cooldown_seconds == 3600.0
+
+
+def test_scan_history_stores_extras_sparsely():
+    entry = {"timestamp": "2024-01-01T00:00:00", "level": "light", "outcome": "ok", "trust_delta": 1.0}
+    history = Node(id="n1", host="10.0.0.1", scan_history=[entry] * 3).scan_history
+    assert history.extras == {}
+
+    history = history.append({"level": "medium", "note": "manual"})
+    assert history.extras == {3: {"note": "manual"}}
+
+
+def test_decision_timestamp_follows_copied_ts_ns():
+    decision = OrchestrationDecision(next_action="skip", reasoning="r")
+    assert decision.timestamp.timestamp() > 0
+
+    assert decision.model_copy(update={"ts_ns": 0}).timestamp.timestamp() == 0
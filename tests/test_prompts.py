@@ -0,0 +1,28 @@
+"""
+Tests for orchestration prompt generation
+"""
+
+import io
+
+from pgdn_orchestrator import Node, Organisation, ScanPolicy
+from pgdn_orchestrator.prompts import PromptGenerator
+
+
+def test_prompt_into_buffer_matches_prompt_string():
+    generator = PromptGenerator()
+    node = Node(
+        id="n1",
+        host="10.0.0.1",
+        protocol="sui",
+        open_ports=[22, 9000],
+        services={"ssh": "OpenSSH"},
+        trust_score=80.0,
+    )
+    org = Organisation(id="org", whitelisted_protocols=["sui"], ferocious_enabled=True)
+    policy = ScanPolicy(max_escalation="ferocious")
+
+    buf = io.StringIO()
+    buf.write("header\n")
+    generator.generate_orchestration_prompt_into(buf, node, org, policy)
+
+    assert buf.getvalue() == "header\n" + generator.generate_orchestration_prompt(node, org, policy)